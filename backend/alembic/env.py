@@ -13,7 +13,7 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.db.database import Base
-from app.models import User, Word, UserFavorite, UserNotes
+from app.models import User, Word, UserFavorite, UserNotes, WordForm, PdfUpload, WordEmbedding
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,31 @@
+"""add word status and claimed_at
+
+Revision ID: 3f1c2a9b7d10
+Revises: 
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9b7d10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF [NOT] EXISTS: on a fresh database `words` does not exist yet, and
+    # tables created by Base.metadata.create_all already have the columns.
+    # Existing words were all enriched synchronously, so they start out ready.
+    op.execute("ALTER TABLE IF EXISTS words ADD COLUMN IF NOT EXISTS status VARCHAR NOT NULL DEFAULT 'ready'")
+    op.execute("ALTER TABLE IF EXISTS words ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS words DROP COLUMN IF EXISTS claimed_at")
+    op.execute("ALTER TABLE IF EXISTS words DROP COLUMN IF EXISTS status")
@@ -0,0 +1,30 @@
+"""add word enrichment retry tracking
+
+Revision ID: 8b2e4d6f0a13
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f0a13'
+down_revision: Union[str, None] = '3f1c2a9b7d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF [NOT] EXISTS: on a fresh database `words` does not exist yet, and
+    # tables created by Base.metadata.create_all already have the columns
+    op.execute("ALTER TABLE IF EXISTS words ADD COLUMN IF NOT EXISTS enrich_attempts INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE IF EXISTS words ADD COLUMN IF NOT EXISTS next_retry_at TIMESTAMP WITHOUT TIME ZONE")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE IF EXISTS words DROP COLUMN IF EXISTS next_retry_at")
+    op.execute("ALTER TABLE IF EXISTS words DROP COLUMN IF EXISTS enrich_attempts")
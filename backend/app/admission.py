@@ -0,0 +1,177 @@
+"""
+Admission control: per-route-class concurrency limits with load shedding.
+
+Each request is assigned to a route class (cheap reads, writes, PDF
+uploads), each with its own budget of concurrent requests and a bounded
+wait queue. Requests that cannot get a slot within the queue timeout, or
+that find the queue full, are rejected at once with 503 and Retry-After
+instead of piling up behind the database pool, so a burst of uploads
+cannot starve reads or health checks.
+
+Every admitted request holds one primary database connection and (for the
+sync endpoints) one threadpool thread, so the default limits split
+min(DB_POOL_SIZE + DB_MAX_OVERFLOW, THREADPOOL_SIZE) between the classes:
+admitted requests never wait on the pool or the threadpool, out of sight
+of the middleware. `check_budgets` warns at startup when overrides exceed it.
+"""
+import asyncio
+import os
+from typing import Dict, Optional
+
+import anyio.to_thread
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.db.database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+# Paths that are never limited (liveness/readiness probes, root)
+EXEMPT_PATHS = ("/health", "/docs", "/redoc", "/openapi.json")
+UPLOAD_PATHS = ("/api/upload-pdf",)
+
+
+class Budget:
+    """A concurrency limit with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False means shed."""
+        if not self._semaphore.locked():
+            # A slot is free; acquiring it does not suspend
+            await self._semaphore.acquire()
+            self.active += 1
+            return True
+
+        if self.waiting >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+    @property
+    def saturated(self) -> bool:
+        return self.active >= self.limit and self.waiting >= self.queue_size
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "limit": self.limit,
+            "waiting": self.waiting,
+            "queue_size": self.queue_size,
+            "rejected": self.rejected,
+            "saturated": self.saturated,
+        }
+
+
+# Worker threads for sync endpoints and run_in_threadpool (AnyIO's default is 40)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+# Requests that can run at once without waiting on a connection or a thread
+CAPACITY = max(3, min(DB_POOL_SIZE + DB_MAX_OVERFLOW, THREADPOOL_SIZE))
+
+# Default share of CAPACITY per class; uploads get what is left (at least 1)
+DEFAULT_READ_LIMIT = max(1, CAPACITY * 6 // 10)
+DEFAULT_WRITE_LIMIT = max(1, CAPACITY * 3 // 10)
+DEFAULT_UPLOAD_LIMIT = max(1, CAPACITY - DEFAULT_READ_LIMIT - DEFAULT_WRITE_LIMIT)
+
+
+def _budget_from_env(name: str, limit: int, retry_after: int) -> Budget:
+    prefix = f"ADMISSION_{name.upper()}"
+    limit = int(os.getenv(f"{prefix}_LIMIT", str(limit)))
+    return Budget(
+        name,
+        limit=limit,
+        queue_size=int(os.getenv(f"{prefix}_QUEUE", str(2 * limit))),
+        queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5")),
+        retry_after=retry_after,
+    )
+
+
+budgets: Dict[str, Budget] = {
+    "read": _budget_from_env("read", DEFAULT_READ_LIMIT, retry_after=1),
+    "write": _budget_from_env("write", DEFAULT_WRITE_LIMIT, retry_after=2),
+    "upload": _budget_from_env("upload", DEFAULT_UPLOAD_LIMIT, retry_after=10),
+}
+
+
+def check_budgets() -> None:
+    """
+    Size the threadpool and warn if the admission limits exceed what the
+    database pool and threadpool can serve at once. Call from startup.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    admitted = sum(budget.limit for budget in budgets.values())
+    if admitted > CAPACITY:
+        print(
+            f"Warning: admission limits allow {admitted} concurrent requests, but "
+            f"the database pool ({DB_POOL_SIZE} + {DB_MAX_OVERFLOW}) and threadpool "
+            f"({THREADPOOL_SIZE}) serve {CAPACITY}; excess requests will queue unseen"
+        )
+
+
+def route_class(scope: Scope) -> Optional[str]:
+    """The budget a request draws from, or None if it is not limited."""
+    path = scope["path"]
+    if path == "/" or path.startswith(EXEMPT_PATHS):
+        return None
+    if path in UPLOAD_PATHS:
+        return "upload"
+    if scope["method"] in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    return "write"
+
+
+def saturation() -> dict:
+    return {name: budget.stats() for name, budget in budgets.items()}
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope)
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        budget = budgets[name]
+        if not await budget.acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(budget.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.release()
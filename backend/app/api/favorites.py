@@ -1,8 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.user_favorite import UserFavorite
-from app.models.word import Word
+from app.models.word import Word, WORD_STATUS_READY
+from app.models.user_notes import UserNotes
+from app.api.notes import NOTES_COLUMNS
+from app.api.words import WORD_COLUMNS, serialize_word_row
 from app.api.auth import get_current_user
 from app.models.user import User
 import uuid
@@ -11,7 +16,7 @@ router = APIRouter()
 
 
 @router.post("/favorite/{word_id}")
-async def toggle_favorite(
+def toggle_favorite(
     word_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -22,8 +27,12 @@ async def toggle_favorite(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid word ID")
     
-    # Check if word exists
-    word = db.query(Word).filter(Word.id == word_uuid).first()
+    # Check if word exists (and is enriched)
+    word = (
+        db.query(Word)
+        .filter(Word.id == word_uuid, Word.status == WORD_STATUS_READY)
+        .first()
+    )
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
@@ -51,28 +60,38 @@ async def toggle_favorite(
 
 
 @router.get("/favorites")
-async def get_favorites(
-    db: Session = Depends(get_db),
+def get_favorites(
+    include_notes: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all favorite words for current user."""
-    favorites = (
-        db.query(UserFavorite)
-        .filter(UserFavorite.user_id == current_user.id)
-        .all()
-    )
+    """
+    Get all favorite words for current user.
+    With include_notes=true, each word also carries the user's notes.
+    """
+    columns = [*WORD_COLUMNS]
+    if include_notes:
+        columns.extend(NOTES_COLUMNS)
     
-    words = []
-    for fav in favorites:
-        word = db.query(Word).filter(Word.id == fav.word_id).first()
-        if word:
-            words.append({
-                "id": str(word.id),
-                "word": word.word,
-                "meaning": word.meaning,
-                "example_sentence_1": word.example_sentence_1,
-                "example_sentence_2": word.example_sentence_2,
-                "source": word.source,
-            })
+    stmt = (
+        select(*columns)
+        .where(Word.status == WORD_STATUS_READY)
+        .join(
+            UserFavorite,
+            and_(
+                UserFavorite.word_id == Word.id,
+                UserFavorite.user_id == current_user.id,
+            ),
+        )
+    )
+    if include_notes:
+        stmt = stmt.outerjoin(
+            UserNotes,
+            and_(
+                UserNotes.word_id == Word.id,
+                UserNotes.user_id == current_user.id,
+            ),
+        )
     
-    return words
+    rows = db.execute(stmt.order_by(UserFavorite.created_at)).mappings()
+    return ORJSONResponse([serialize_word_row(row, include_notes) for row in rows])
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.user_notes import UserNotes
-from app.models.word import Word
+from app.models.word import Word, WORD_STATUS_READY
 from app.api.auth import get_current_user
 from app.models.user import User
 from pydantic import BaseModel
+from typing import Optional
 import uuid
 
 router = APIRouter()
 
+# Most word IDs accepted by a single batch notes request
+MAX_BATCH_NOTES = 500
+
 
 class NotesUpdate(BaseModel):
     custom_meaning: str | None = None
@@ -17,8 +21,54 @@ class NotesUpdate(BaseModel):
     custom_sentence_2: str | None = None
 
 
+# Columns for embedding a user's notes in a joined listing query
+NOTES_COLUMNS = (
+    UserNotes.id.label("notes_id"),
+    UserNotes.custom_meaning,
+    UserNotes.custom_sentence_1,
+    UserNotes.custom_sentence_2,
+    UserNotes.updated_at.label("notes_updated_at"),
+)
+
+
+def serialize_notes_row(word_id, row) -> dict:
+    """Like serialize_notes, for a result row selected with NOTES_COLUMNS."""
+    if row["notes_id"] is None:
+        return serialize_notes(word_id, None)
+    
+    return {
+        "id": str(row["notes_id"]),
+        "word_id": str(word_id),
+        "custom_meaning": row["custom_meaning"],
+        "custom_sentence_1": row["custom_sentence_1"],
+        "custom_sentence_2": row["custom_sentence_2"],
+        "updated_at": row["notes_updated_at"].isoformat(),
+    }
+
+
+def serialize_notes(word_id, user_notes: Optional[UserNotes]) -> dict:
+    """Notes for a word as returned by the API (empty fields if there are none)."""
+    if not user_notes:
+        return {
+            "id": None,
+            "word_id": str(word_id),
+            "custom_meaning": None,
+            "custom_sentence_1": None,
+            "custom_sentence_2": None,
+        }
+    
+    return {
+        "id": str(user_notes.id),
+        "word_id": str(word_id),
+        "custom_meaning": user_notes.custom_meaning,
+        "custom_sentence_1": user_notes.custom_sentence_1,
+        "custom_sentence_2": user_notes.custom_sentence_2,
+        "updated_at": user_notes.updated_at.isoformat(),
+    }
+
+
 @router.put("/notes/{word_id}")
-async def update_notes(
+def update_notes(
     word_id: str,
     notes: NotesUpdate,
     db: Session = Depends(get_db),
@@ -30,8 +80,12 @@ async def update_notes(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid word ID")
     
-    # Check if word exists
-    word = db.query(Word).filter(Word.id == word_uuid).first()
+    # Check if word exists (and is enriched)
+    word = (
+        db.query(Word)
+        .filter(Word.id == word_uuid, Word.status == WORD_STATUS_READY)
+        .first()
+    )
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
@@ -67,20 +121,47 @@ async def update_notes(
     db.commit()
     db.refresh(user_notes)
     
-    return {
-        "id": str(user_notes.id),
-        "word_id": str(word_id),
-        "custom_meaning": user_notes.custom_meaning,
-        "custom_sentence_1": user_notes.custom_sentence_1,
-        "custom_sentence_2": user_notes.custom_sentence_2,
-        "updated_at": user_notes.updated_at.isoformat(),
+    return serialize_notes(word_id, user_notes)
+
+
+@router.get("/notes")
+def get_notes_batch(
+    ids: str = Query(..., description="Comma-separated word IDs"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get notes for several words at once, in the order requested."""
+    try:
+        word_uuids = [uuid.UUID(word_id) for word_id in ids.split(",") if word_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid word ID")
+    
+    if len(word_uuids) > MAX_BATCH_NOTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_NOTES} word IDs per request",
+        )
+    
+    notes_by_word = {
+        user_notes.word_id: user_notes
+        for user_notes in db.query(UserNotes)
+        .filter(
+            UserNotes.user_id == current_user.id,
+            UserNotes.word_id.in_(word_uuids),
+        )
+        .all()
     }
+    
+    return [
+        serialize_notes(word_uuid, notes_by_word.get(word_uuid))
+        for word_uuid in word_uuids
+    ]
 
 
 @router.get("/notes/{word_id}")
-async def get_notes(
+def get_notes(
     word_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get notes for a word."""
@@ -98,20 +179,4 @@ async def get_notes(
         .first()
     )
     
-    if not user_notes:
-        return {
-            "id": None,
-            "word_id": word_id,
-            "custom_meaning": None,
-            "custom_sentence_1": None,
-            "custom_sentence_2": None,
-        }
-    
-    return {
-        "id": str(user_notes.id),
-        "word_id": str(word_id),
-        "custom_meaning": user_notes.custom_meaning,
-        "custom_sentence_1": user_notes.custom_sentence_1,
-        "custom_sentence_2": user_notes.custom_sentence_2,
-        "updated_at": user_notes.updated_at.isoformat(),
-    }
+    return serialize_notes(word_id, user_notes)
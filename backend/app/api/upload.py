@@ -1,16 +1,22 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.db.database import get_db
-from app.models.word import Word
+from app.models.word import Word, WORD_STATUS_READY
+from app.models.pdf_upload import PdfUpload
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.services.pdf_parser import extract_words_from_pdf
-from app.services.word_service import create_word_with_llm
+from app.services.pdf_parser import extract_word_forms_from_pdf
+from app.services.word_service import group_forms, record_forms_bulk
+from app.services.word_queue import get_word_queue
 import boto3
 import os
 from dotenv import load_dotenv
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from io import BytesIO
+import hashlib
+import uuid
 
 load_dotenv()
 
@@ -27,6 +33,83 @@ s3_client = boto3.client(
     region_name=AWS_REGION,
 )
 
+# Size of the chunks read from the request body while hashing
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_and_hash(file: UploadFile) -> Tuple[bytes, str]:
+    """Read an upload in chunks, computing its SHA-256 as it streams in."""
+    digest = hashlib.sha256()
+    buffer = BytesIO()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        buffer.write(chunk)
+    return buffer.getvalue(), digest.hexdigest()
+
+
+async def store_pdf(content: bytes, content_hash: str) -> Optional[str]:
+    """
+    Upload a PDF to S3 (if configured), content-addressed so each file is
+    stored once. Returns the S3 key, or None if it could not be stored.
+    """
+    if not os.getenv("AWS_ACCESS_KEY_ID"):
+        return None
+    s3_key = f"uploads/sha256/{content_hash}.pdf"
+    try:
+        await run_in_threadpool(
+            s3_client.upload_fileobj,
+            BytesIO(content),
+            S3_BUCKET,
+            s3_key,
+        )
+    except Exception as e:
+        print(f"Warning: Could not upload to S3: {e}")
+        return None
+    return s3_key
+
+
+def save_upload(db: Session, upload: PdfUpload) -> None:
+    """Store a parsed upload; a concurrent upload of the same file wins."""
+    db.add(upload)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same file finished uploading concurrently; its row is equivalent
+        db.rollback()
+
+
+def save_s3_key(db: Session, upload: PdfUpload, s3_key: str) -> None:
+    upload.s3_key = s3_key
+    db.commit()
+
+
+def resolve_words(
+    db: Session, word_forms: Dict[str, List[str]]
+) -> Tuple[Dict[str, List[str]], Dict[str, uuid.UUID]]:
+    """
+    Regroup extracted forms against the database, so they resolve like
+    get_word_by_text ("abated" lands on a stored "abate", recorded forms on
+    their word), and record the forms of words that are already enriched.
+    Returns the regrouped forms and {lemma: word ID} for the enriched ones.
+    """
+    word_forms = group_forms(db, [form for forms in word_forms.values() for form in forms])
+    existing = dict(
+        db.query(Word.word, Word.id)
+        .filter(Word.word.in_(list(word_forms)), Word.status == WORD_STATUS_READY)
+        .all()
+    )
+    record_forms_bulk(
+        db,
+        {
+            word_id: [form for form in word_forms[lemma] if form != lemma]
+            for lemma, word_id in existing.items()
+        },
+    )
+    return word_forms, existing
+
 
 @router.post("/upload-pdf")
 async def upload_pdf(
@@ -35,60 +118,83 @@ async def upload_pdf(
     current_user: User = Depends(get_current_user),
 ):
     """
-    Upload a PDF file, extract words, and trigger background processing.
-    In production, this would upload to S3 and trigger a Lambda/SQS workflow.
+    Upload a PDF file, extract words, and queue new ones for background
+    enrichment by the worker. Returns without waiting for the LLM.
     """
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="File must be a PDF")
     
-    # Read file content
-    content = await file.read()
-    
-    # Extract words from PDF
-    try:
-        words_list = extract_words_from_pdf(content)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error parsing PDF: {str(e)}")
-    
-    if not words_list:
-        raise HTTPException(status_code=400, detail="No words found in PDF")
+    # Read file content, hashing it as it streams in
+    content, content_hash = await read_and_hash(file)
     
-    # Upload to S3 (if configured)
-    s3_key = None
-    if os.getenv("AWS_ACCESS_KEY_ID"):
+    # Identical files are parsed and stored only once. Database work runs in
+    # the threadpool (see save_upload, resolve_words) so a large PDF's queries
+    # do not stall the event loop
+    cached_upload = await run_in_threadpool(
+        db.query(PdfUpload).filter(PdfUpload.content_hash == content_hash).first
+    )
+    cached = cached_upload is not None
+    if cached:
+        word_forms = cached_upload.word_forms
+        s3_key = cached_upload.s3_key
+        if s3_key is None:
+            # The first upload could not be stored; try again with this copy
+            s3_key = await store_pdf(content, content_hash)
+            if s3_key is not None:
+                await run_in_threadpool(save_s3_key, db, cached_upload, s3_key)
+    else:
+        # Extract words from PDF, collapsed to lemmas ("abated" -> "abate")
         try:
-            s3_key = f"uploads/{current_user.id}/{file.filename}"
-            s3_client.upload_fileobj(
-                BytesIO(content),
-                S3_BUCKET,
-                s3_key,
-            )
+            # CPU-bound; keep it off the event loop
+            word_forms = await run_in_threadpool(extract_word_forms_from_pdf, content)
         except Exception as e:
-            print(f"Warning: Could not upload to S3: {e}")
+            raise HTTPException(status_code=400, detail=f"Error parsing PDF: {str(e)}")
+        
+        if not word_forms:
+            raise HTTPException(status_code=400, detail="No words found in PDF")
+        
+        # Upload to S3 (if configured)
+        s3_key = await store_pdf(content, content_hash)
+        
+        await run_in_threadpool(
+            save_upload,
+            db,
+            PdfUpload(
+                content_hash=content_hash,
+                size_bytes=len(content),
+                s3_key=s3_key,
+                word_forms=word_forms,
+                first_uploaded_by=current_user.id,
+            ),
+        )
     
-    # In production, you would:
-    # 1. Upload PDF to S3
-    # 2. Send words to SQS queue
-    # 3. Worker processes words asynchronously
+    # Words already enriched only get their surface forms recorded; the rest
+    # are published to the word queue and enriched by the worker
+    word_forms, existing = await run_in_threadpool(resolve_words, db, word_forms)
+    words_list = sorted(word_forms)
     
-    # For now, we'll process words synchronously (not ideal for production)
-    # In production, return immediately and process via SQS worker
-    processed_words = []
+    processed_words = [
+        {"word": lemma, "status": "exists"} for lemma in words_list if lemma in existing
+    ]
     errors = []
+    jobs = [
+        {"word": lemma, "source": "pdf", "forms": word_forms[lemma]}
+        for lemma in words_list
+        if lemma not in existing
+    ]
     
-    for word_text in words_list[:10]:  # Limit to 10 for demo
+    if jobs:
         try:
-            # Check if word already exists
-            existing = db.query(Word).filter(Word.word == word_text.lower()).first()
-            if existing:
-                processed_words.append({"word": word_text, "status": "exists"})
-                continue
-            
-            # Create word with LLM generation
-            word = await create_word_with_llm(db, word_text, source="pdf")
-            processed_words.append({"word": word_text, "status": "created", "id": str(word.id)})
+            rejected = await run_in_threadpool(get_word_queue().publish, jobs)
         except Exception as e:
-            errors.append({"word": word_text, "error": str(e)})
+            print(f"Warning: Could not queue words: {e}")
+            rejected = jobs
+        rejected_words = {job["word"] for job in rejected}
+        for job in jobs:
+            if job["word"] in rejected_words:
+                errors.append({"word": job["word"], "error": "Could not queue word"})
+            else:
+                processed_words.append({"word": job["word"], "status": "queued"})
     
     return {
         "message": f"Processed {len(processed_words)} words",
@@ -96,4 +202,6 @@ async def upload_pdf(
         "processed": processed_words,
         "errors": errors,
         "s3_key": s3_key,
+        "content_hash": content_hash,
+        "cached": cached,
     }
@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
-from app.models.word import Word
+from typing import List, Optional
+from app.db.database import get_read_db
+from app.models.word import Word, WORD_STATUS_READY
 from app.models.user_favorite import UserFavorite
+from app.models.user_notes import UserNotes
+from app.api.notes import NOTES_COLUMNS, serialize_notes_row
 from app.api.auth import get_current_user
+from app.services.similarity import sync_index
 from app.models.user import User
 from pydantic import BaseModel
 import uuid
 
 router = APIRouter()
 
+MAX_SIMILAR_WORDS = 50
+
 
 class WordResponse(BaseModel):
     id: str
@@ -20,50 +27,97 @@ class WordResponse(BaseModel):
     example_sentence_2: str | None
     source: str
     is_favorite: bool = False
+    notes: Optional[dict] = None  # only with include_notes=true
 
     class Config:
         from_attributes = True
 
 
+class SimilarWordResponse(BaseModel):
+    id: str
+    word: str
+    score: float  # cosine similarity, higher is closer
+
+
+# Columns returned by the word listings; rows are serialized without ORM objects
+WORD_COLUMNS = (
+    Word.id,
+    Word.word,
+    Word.meaning,
+    Word.example_sentence_1,
+    Word.example_sentence_2,
+    Word.source,
+)
+
+
+def serialize_word_row(row, include_notes: bool = False) -> dict:
+    """A listing row (WORD_COLUMNS, optionally NOTES_COLUMNS) as a response dict."""
+    item = {
+        "id": str(row["id"]),
+        "word": row["word"],
+        "meaning": row["meaning"],
+        "example_sentence_1": row["example_sentence_1"],
+        "example_sentence_2": row["example_sentence_2"],
+        "source": row["source"],
+    }
+    if include_notes:
+        item["notes"] = serialize_notes_row(row["id"], row)
+    return item
+
+
 @router.get("/words", response_model=List[WordResponse])
-async def get_words(
+def get_words(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    include_notes: bool = False,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all words with favorite status for current user."""
-    words = db.query(Word).offset(skip).limit(limit).all()
+    """
+    Get all words with favorite status for current user.
+    With include_notes=true, each word also carries the user's notes.
+    Favorites and notes are joined into the same query as the page of words,
+    and rows go straight to JSON (response_model is only used for the docs).
+    """
+    columns = [*WORD_COLUMNS, UserFavorite.id.isnot(None).label("is_favorite")]
+    if include_notes:
+        columns.extend(NOTES_COLUMNS)
     
-    # Get user's favorite word IDs
-    favorite_ids = {
-        fav.word_id
-        for fav in db.query(UserFavorite)
-        .filter(UserFavorite.user_id == current_user.id)
-        .all()
-    }
+    stmt = (
+        select(*columns)
+        .where(Word.status == WORD_STATUS_READY)
+        .outerjoin(
+            UserFavorite,
+            and_(
+                UserFavorite.word_id == Word.id,
+                UserFavorite.user_id == current_user.id,
+            ),
+        )
+    )
+    if include_notes:
+        stmt = stmt.outerjoin(
+            UserNotes,
+            and_(
+                UserNotes.word_id == Word.id,
+                UserNotes.user_id == current_user.id,
+            ),
+        )
     
     result = []
-    for word in words:
-        result.append(
-            WordResponse(
-                id=str(word.id),
-                word=word.word,
-                meaning=word.meaning,
-                example_sentence_1=word.example_sentence_1,
-                example_sentence_2=word.example_sentence_2,
-                source=word.source,
-                is_favorite=word.id in favorite_ids,
-            )
-        )
+    for row in db.execute(stmt.offset(skip).limit(limit)).mappings():
+        item = serialize_word_row(row, include_notes)
+        item["is_favorite"] = row["is_favorite"]
+        if not include_notes:
+            item["notes"] = None
+        result.append(item)
     
-    return result
+    return ORJSONResponse(result)
 
 
 @router.get("/words/{word_id}", response_model=WordResponse)
-async def get_word(
+def get_word(
     word_id: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get a specific word by ID."""
@@ -72,7 +126,11 @@ async def get_word(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid word ID")
     
-    word = db.query(Word).filter(Word.id == word_uuid).first()
+    word = (
+        db.query(Word)
+        .filter(Word.id == word_uuid, Word.status == WORD_STATUS_READY)
+        .first()
+    )
     if not word:
         raise HTTPException(status_code=404, detail="Word not found")
     
@@ -96,3 +154,34 @@ async def get_word(
         source=word.source,
         is_favorite=is_favorite,
     )
+
+
+@router.get("/words/{word_id}/similar", response_model=List[SimilarWordResponse])
+def get_similar_words(
+    word_id: str,
+    limit: int = 10,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Words closest in meaning and spelling to the given word, best first.
+    Also useful as plausible quiz distractors. Answered from the in-memory
+    similarity index; the database is only read when the index is due for
+    a sync.
+    """
+    try:
+        word_uuid = uuid.UUID(word_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid word ID")
+    
+    index = sync_index(db)
+    if word_uuid not in index:
+        raise HTTPException(status_code=404, detail="Word not found or not indexed yet")
+    
+    limit = max(1, min(limit, MAX_SIMILAR_WORDS))
+    return ORJSONResponse(
+        [
+            {"id": str(similar_id), "word": word, "score": round(score, 4)}
+            for similar_id, word, score in index.similar(word_uuid, limit)
+        ]
+    )
@@ -0,0 +1,341 @@
+"""
+Command line tools.
+
+    python -m app.cli seed wordlist.txt [--chunk-size 500] [--concurrency 8]
+    python -m app.cli embed [--batch-size 256]
+
+`seed` streams a word list (one word per line, "#" for comments), skips
+words already in the database (under any form), claims the rest like
+`word_service.claim_word` does (words an upload or the worker is already
+enriching are left to them), enriches its claims with bounded concurrency
+and commits each chunk in one transaction. Claims are refreshed while a
+chunk is enriched, so a slow chunk is not taken over after
+WORD_CLAIM_TIMEOUT_SECONDS, and released if the run stops. Progress is
+saved to a checkpoint file after every chunk, so an interrupted run picks
+up where it stopped when started again with the same arguments.
+
+`embed` backfills similarity embeddings for ready words that have none
+from the configured EMBEDDING_PROVIDER (e.g. after switching providers).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.models.word import Word, WORD_STATUS_PENDING, WORD_STATUS_READY
+from app.models.word_form import WordForm
+from app.services.enrichment import enrich_word
+from app.services.similarity import embed_words_safely, missing_embeddings, store_embeddings
+from app.services.word_service import (
+    claim_words,
+    group_forms,
+    keep_claims,
+    release_claims,
+)
+from app.services.llm_scheduler import (
+    CircuitOpenError,
+    LLMUnavailableError,
+    PRIORITY_BULK,
+)
+
+# Times a word waits out an open circuit breaker before it is left pending
+CIRCUIT_WAITS = 3
+
+
+def read_words(path: str, start_line: int = 0) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, word) for each word after `start_line`."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line_no <= start_line:
+                continue
+            word = line.strip().lower()
+            if word and not word.startswith("#"):
+                yield line_no, word
+
+
+def count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def chunked(items: Iterable[Tuple[int, str]], size: int) -> Iterator[List[Tuple[int, str]]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def new_checkpoint() -> dict:
+    return {"line": 0, "created": 0, "pending": 0, "skipped": 0, "done": False}
+
+
+def load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return new_checkpoint()
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def new_lemmas(db: Session, words: List[str]) -> Dict[str, List[str]]:
+    """
+    Group a chunk by lemma, dropping words the database already has.
+    Forms resolve like `get_word_by_text`: "abated" is dropped when
+    "abate" is stored, even if "abated" was never seen before.
+    """
+    groups = group_forms(db, words)
+    ready = {
+        word
+        for (word,) in db.query(Word.word)
+        .filter(Word.word.in_(list(groups)), Word.status == WORD_STATUS_READY)
+        .all()
+    }
+    return {lemma: forms for lemma, forms in groups.items() if lemma not in ready}
+
+
+async def enrich_chunk(lemmas: List[str], concurrency: int) -> Dict[str, Optional[dict]]:
+    """Enrich lemmas with at most `concurrency` in flight; None marks a failure."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def enrich_one(lemma: str) -> Optional[dict]:
+        async with semaphore:
+            for _ in range(CIRCUIT_WAITS):
+                try:
+                    # Sentences for dictionary words are filled in by the worker
+                    return await enrich_word(lemma, priority=PRIORITY_BULK, defer_sentences=True)
+                except CircuitOpenError as e:
+                    await asyncio.sleep(e.retry_after or 5)
+                except LLMUnavailableError as e:
+                    print(f"  {lemma}: left pending ({e})")
+                    return None
+            return None
+
+    results = await asyncio.gather(*(enrich_one(lemma) for lemma in lemmas))
+    return dict(zip(lemmas, results))
+
+
+def store_chunk(
+    db: Session,
+    groups: Dict[str, List[str]],
+    word_ids: Dict[str, uuid.UUID],
+    results: Dict[str, Optional[dict]],
+    claimed_at: datetime,
+) -> Tuple[int, int]:
+    """
+    Write a chunk's enriched words and all its forms in one transaction.
+    Only rows still under this run's claim are written; failed words are
+    released as pending for the worker's retry_pending_words.
+    """
+    words = Word.__table__
+    ready_rows = [
+        {
+            "b_id": word_ids[lemma],
+            "b_meaning": data["meaning"],
+            "b_sentence_1": data["example_sentence_1"],
+            "b_sentence_2": data["example_sentence_2"],
+        }
+        for lemma, data in results.items()
+        if data is not None
+    ]
+    failed_ids = [word_ids[lemma] for lemma, data in results.items() if data is None]
+
+    if ready_rows:
+        db.execute(
+            words.update()
+            .where(
+                words.c.id == bindparam("b_id"),
+                words.c.status == WORD_STATUS_PENDING,
+                # Never overwrite a claim somebody took over after CLAIM_TIMEOUT
+                words.c.claimed_at == claimed_at,
+            )
+            .values(
+                meaning=bindparam("b_meaning"),
+                example_sentence_1=bindparam("b_sentence_1"),
+                example_sentence_2=bindparam("b_sentence_2"),
+                status=WORD_STATUS_READY,
+                claimed_at=None,
+            ),
+            ready_rows,
+        )
+    if failed_ids:
+        db.execute(
+            update(Word)
+            .where(
+                Word.id.in_(failed_ids),
+                Word.status == WORD_STATUS_PENDING,
+                Word.claimed_at == claimed_at,
+            )
+            .values(claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    all_ids = dict(
+        db.query(Word.word, Word.id).filter(Word.word.in_(list(groups))).all()
+    )
+    form_rows = [
+        {"form": form, "word_id": all_ids[lemma]}
+        for lemma, forms in groups.items()
+        if lemma in all_ids
+        for form in forms
+        if form != lemma
+    ]
+    if form_rows:
+        db.execute(
+            pg_insert(WordForm).values(form_rows).on_conflict_do_nothing(index_elements=[WordForm.form])
+        )
+
+    db.commit()
+    return len(ready_rows), len(failed_ids)
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m{seconds % 60:02d}s"
+
+
+async def seed(
+    path: str,
+    chunk_size: int,
+    concurrency: int,
+    checkpoint_path: str,
+    source: str,
+    restart: bool,
+) -> None:
+    checkpoint = new_checkpoint() if restart else load_checkpoint(checkpoint_path)
+    if checkpoint.get("done"):
+        print(f"{path} was already seeded (remove {checkpoint_path} or use --restart)")
+        return
+
+    total_lines = count_lines(path)
+    start_line = checkpoint["line"]
+    if start_line:
+        print(f"Resuming {path} after line {start_line} of {total_lines}")
+
+    started = time.monotonic()
+    db = SessionLocal()
+    try:
+        for chunk in chunked(read_words(path, start_line), chunk_size):
+            groups = new_lemmas(db, [word for _, word in chunk])
+            word_ids, claimed_at = claim_words(db, sorted(groups), source)
+            # Lemmas already in the database, or being enriched elsewhere
+            skipped = len(chunk) - sum(len(groups[lemma]) for lemma in word_ids)
+
+            claim = {"claimed_at": claimed_at}
+            heartbeat = asyncio.create_task(keep_claims(db, word_ids.values(), claim))
+            stored = False
+            try:
+                results = await enrich_chunk(sorted(word_ids), concurrency)
+                created, pending = store_chunk(db, groups, word_ids, results, claim["claimed_at"])
+                stored = True
+            finally:
+                heartbeat.cancel()
+                if not stored and word_ids:
+                    # Interrupted: hand the words back instead of leaving
+                    # live-looking claims a restart would skip
+                    db.rollback()
+                    release_claims(db, word_ids.values(), claim["claimed_at"])
+            ready = [lemma for lemma, data in results.items() if data is not None]
+            if ready:
+                await embed_words_safely(db, db.query(Word).filter(Word.word.in_(ready)).all())
+
+            checkpoint["line"] = chunk[-1][0]
+            checkpoint["created"] += created
+            checkpoint["pending"] += pending
+            checkpoint["skipped"] += skipped
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = time.monotonic() - started
+            lines_done = checkpoint["line"] - start_line
+            rate = lines_done / elapsed if elapsed else 0.0
+            eta = (total_lines - checkpoint["line"]) / rate if rate else 0.0
+            print(
+                f"line {checkpoint['line']}/{total_lines}: "
+                f"+{created} created, +{pending} pending, +{skipped} skipped | "
+                f"{rate:.1f} lines/s, ETA {format_duration(eta)}"
+            )
+    finally:
+        db.close()
+
+    checkpoint["done"] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    print(
+        f"Done in {format_duration(time.monotonic() - started)}: "
+        f"{checkpoint['created']} created, {checkpoint['pending']} pending, "
+        f"{checkpoint['skipped']} already present or being enriched elsewhere"
+    )
+
+
+async def embed(batch_size: int) -> None:
+    started = time.monotonic()
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            words = missing_embeddings(db, batch_size)
+            if not words:
+                break
+            total += await store_embeddings(db, words, priority=PRIORITY_BULK)
+            print(f"{total} words embedded")
+    finally:
+        db.close()
+    print(f"Done in {format_duration(time.monotonic() - started)}: {total} words embedded")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Bulk-load a word list")
+    seed_parser.add_argument("wordlist", help="File with one word per line")
+    seed_parser.add_argument("--chunk-size", type=int, default=500, help="Words per transaction")
+    seed_parser.add_argument("--concurrency", type=int, default=8, help="Enrichments in flight")
+    seed_parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: <wordlist>.checkpoint)"
+    )
+    seed_parser.add_argument("--source", default="seed", help="Value for words.source")
+    seed_parser.add_argument(
+        "--restart", action="store_true", help="Ignore any existing checkpoint"
+    )
+
+    embed_parser = commands.add_parser("embed", help="Backfill similarity embeddings")
+    embed_parser.add_argument("--batch-size", type=int, default=256, help="Words per request")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        asyncio.run(
+            seed(
+                args.wordlist,
+                chunk_size=args.chunk_size,
+                concurrency=args.concurrency,
+                checkpoint_path=args.checkpoint or f"{args.wordlist}.checkpoint",
+                source=args.source,
+                restart=args.restart,
+            )
+        )
+    elif args.command == "embed":
+        asyncio.run(embed(args.batch_size))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
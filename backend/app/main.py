@@ -1,13 +1,21 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.admission import AdmissionControlMiddleware, budgets, check_budgets, saturation
 from app.api import auth, words, favorites, upload, notes
-from app.db.database import engine, Base
+from app.db.database import engine, Base, LAST_WRITE_HEADER, last_write_marker
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="SAT Vocabulary API", version="1.0.0")
 
+# Admission control: sheds load with 503 + Retry-After instead of queueing
+# indefinitely. Added before CORS so rejections still carry CORS headers.
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -15,8 +23,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
+# Read-your-writes: successful writes tell the client when they happened; while
+# the client echoes that back, its reads skip the replica (see get_read_db)
+@app.middleware("http")
+async def track_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        response.headers[LAST_WRITE_HEADER] = last_write_marker()
+    return response
+
+
+@app.on_event("startup")
+async def size_concurrency():
+    check_budgets()
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api", tags=["auth"])
 app.include_router(words.router, prefix="/api", tags=["words"])
@@ -31,5 +55,35 @@ async def root():
 
 
 @app.get("/health")
+@app.get("/health/live")
 async def health():
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
+
+
+def _check_database() -> bool:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        print(f"Readiness check failed: {e}")
+        return False
+
+
+@app.get("/health/ready")
+async def ready():
+    """
+    Readiness: the database is reachable and reads are not saturated.
+    Returns 503 otherwise so the load balancer routes around this instance.
+    """
+    database_ok = await run_in_threadpool(_check_database)
+    is_ready = database_ok and not budgets["read"].saturated
+    return JSONResponse(
+        {
+            "status": "ready" if is_ready else "not ready",
+            "database": "ok" if database_ok else "unavailable",
+            "saturation": saturation(),
+        },
+        status_code=200 if is_ready else 503,
+    )
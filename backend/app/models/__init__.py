@@ -2,5 +2,8 @@ from app.models.user import User
 from app.models.word import Word
 from app.models.user_favorite import UserFavorite
 from app.models.user_notes import UserNotes
+from app.models.word_form import WordForm
+from app.models.pdf_upload import PdfUpload
+from app.models.word_embedding import WordEmbedding
 
-__all__ = ["User", "Word", "UserFavorite", "UserNotes"]
+__all__ = ["User", "Word", "UserFavorite", "UserNotes", "WordForm", "PdfUpload", "WordEmbedding"]
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, JSON
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from app.db.database import Base
+
+
+class PdfUpload(Base):
+    """A parsed PDF, keyed by the SHA-256 of its content."""
+
+    __tablename__ = "pdf_uploads"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    s3_key = Column(String, nullable=True)
+    word_forms = Column(JSON, nullable=False)  # {lemma: [surface forms]}
+    first_uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
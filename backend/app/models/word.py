@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Integer, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime
 from app.db.database import Base
 
+WORD_STATUS_PENDING = "pending"  # claimed for enrichment, no LLM data yet
+WORD_STATUS_READY = "ready"
+
 
 class Word(Base):
     __tablename__ = "words"
@@ -14,9 +17,15 @@ class Word(Base):
     meaning = Column(Text, nullable=True)
     example_sentence_1 = Column(Text, nullable=True)
     example_sentence_2 = Column(Text, nullable=True)
-    source = Column(String, default="manual")  # pdf or manual
+    source = Column(String, default="manual")  # pdf, manual or seed
+    status = Column(String, default=WORD_STATUS_READY, server_default=WORD_STATUS_READY, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)  # when a process claimed a pending word for enrichment
+    enrich_attempts = Column(Integer, default=0, server_default="0", nullable=False)  # failed enrichments so far
+    next_retry_at = Column(DateTime, nullable=True)  # pending words are not retried automatically before this
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     favorites = relationship("UserFavorite", back_populates="word", cascade="all, delete-orphan")
     notes = relationship("UserNotes", back_populates="word", cascade="all, delete-orphan")
+    forms = relationship("WordForm", back_populates="word", cascade="all, delete-orphan")
+    embedding = relationship("WordEmbedding", back_populates="word", uselist=False, cascade="all, delete-orphan")
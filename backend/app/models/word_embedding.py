@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.database import Base
+
+
+class WordEmbedding(Base):
+    """A word's embedding vector, used by the in-memory similarity index."""
+
+    __tablename__ = "word_embeddings"
+
+    word_id = Column(UUID(as_uuid=True), ForeignKey("words.id"), primary_key=True)
+    provider = Column(String, nullable=False)  # embedding provider name, e.g. local or openai
+    dimensions = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # little-endian float32, unit length
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Relationships
+    word = relationship("Word", back_populates="embedding")
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+import uuid
+from datetime import datetime
+from app.db.database import Base
+
+
+class WordForm(Base):
+    """A surface form (e.g. "abating") seen for a lemma stored in `words`."""
+
+    __tablename__ = "word_forms"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    form = Column(String, unique=True, index=True, nullable=False)
+    word_id = Column(UUID(as_uuid=True), ForeignKey("words.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    word = relationship("Word", back_populates="forms")
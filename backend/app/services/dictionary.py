@@ -0,0 +1,200 @@
+"""
+Offline dictionary lookups backed by a memory-mapped index.
+
+Two dictionaries are bundled and searched in order: the hand-written
+definitions of SAT words in app/data/dictionary.tsv, then app/data/wordnet.tsv,
+generated from Princeton WordNet 3.0 (see app.services.wordnet) and
+covering most English lemmas.
+
+The source is a tab-separated file (word, meaning and optionally two
+example sentences per line, "#" for comments). On first use it is compiled
+into a compact sorted index next to it (or in the temp directory when that
+is not writable) and memory-mapped, so lookups are a binary search with no
+parsing and the pages are shared between worker processes.
+
+Index layout (little-endian):
+    b"SATDICT1" | count: u32 | offsets: (count + 1) * u32 | records
+where each record is the UTF-8 encoded "word\\tmeaning\\tsentence1\\tsentence2".
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+MAGIC = b"SATDICT1"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+DEFAULT_DICTIONARY_PATH = os.path.join(DATA_DIR, "dictionary.tsv")
+WORDNET_DICTIONARY_PATH = os.path.join(DATA_DIR, "wordnet.tsv")
+# LOCAL_DICTIONARY_PATH takes one or more TSVs, separated like PATH entries
+DEFAULT_DICTIONARY_PATHS = os.pathsep.join([DEFAULT_DICTIONARY_PATH, WORDNET_DICTIONARY_PATH])
+
+
+def parse_tsv(tsv_path: str) -> Dict[str, List[str]]:
+    """Read a dictionary TSV into {word: [meaning, sentence1, sentence2]}."""
+    entries: Dict[str, List[str]] = {}
+    with open(tsv_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = [field.strip() for field in line.split("\t")]
+            word = fields[0].lower()
+            if not word or len(fields) < 2 or not fields[1]:
+                continue
+            entries[word] = (fields[1:] + ["", ""])[:3]
+    return entries
+
+
+def build_index(tsv_path: str, index_path: str) -> None:
+    """Compile a dictionary TSV into the binary index format."""
+    entries = parse_tsv(tsv_path)
+    records = sorted(
+        "\t".join([word] + fields).encode("utf-8") for word, fields in entries.items()
+    )
+
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records)))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, index_path)
+
+
+class LocalDictionary:
+    """Read-only view over a compiled dictionary index."""
+
+    def __init__(self, index_path: str):
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{index_path} is not a dictionary index")
+        self._offsets_start = HEADER.size
+        self._data_start = HEADER.size + (self.count + 1) * OFFSET.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, i: int) -> bytes:
+        start, end = struct.unpack_from("<2I", self._mmap, self._offsets_start + i * OFFSET.size)
+        return self._mmap[self._data_start + start:self._data_start + end]
+
+    def _find(self, word: str) -> Optional[bytes]:
+        key = word.lower().strip().encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            mid_key = record.split(b"\t", 1)[0]
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return record
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) is not None
+
+    def lookup(self, word: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return meaning and example sentences for a word, or None."""
+        record = self._find(word)
+        if record is None:
+            return None
+        _, meaning, sentence1, sentence2 = record.decode("utf-8").split("\t")
+        return {
+            "meaning": meaning,
+            "example_sentence_1": sentence1 or None,
+            "example_sentence_2": sentence2 or None,
+        }
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class DictionaryChain:
+    """
+    Several dictionaries searched in order. The first entry found supplies
+    the meaning; example sentences it lacks come from later entries for the
+    same word, as in the enrichment provider chain.
+    """
+
+    def __init__(self, dictionaries: List[LocalDictionary]):
+        self.dictionaries = dictionaries
+
+    def __contains__(self, word: str) -> bool:
+        return any(word in dictionary for dictionary in self.dictionaries)
+
+    def lookup(self, word: str) -> Optional[Dict[str, Optional[str]]]:
+        """Return meaning and example sentences for a word, or None."""
+        found = None
+        for dictionary in self.dictionaries:
+            entry = dictionary.lookup(word)
+            if entry is None:
+                continue
+            if found is None:
+                found = entry
+            else:
+                for field, value in entry.items():
+                    found[field] = found[field] or value
+            if all(found.values()):
+                break
+        return found
+
+    def close(self) -> None:
+        for dictionary in self.dictionaries:
+            dictionary.close()
+
+
+def _index_path_for(tsv_path: str) -> str:
+    index_path = os.path.splitext(tsv_path)[0] + ".idx"
+    if os.access(os.path.dirname(index_path) or ".", os.W_OK):
+        return index_path
+    return os.path.join(tempfile.gettempdir(), os.path.basename(index_path))
+
+
+def open_dictionary(tsv_path: str) -> LocalDictionary:
+    """Open a dictionary TSV, (re)building its index if it is missing or stale."""
+    index_path = _index_path_for(tsv_path)
+    if (
+        not os.path.exists(index_path)
+        or os.path.getmtime(index_path) < os.path.getmtime(tsv_path)
+    ):
+        build_index(tsv_path, index_path)
+    return LocalDictionary(index_path)
+
+
+_dictionaries: Dict[str, DictionaryChain] = {}
+
+
+def get_dictionary(tsv_path: Optional[str] = None) -> DictionaryChain:
+    """
+    The dictionary for one or more TSV paths (separated by os.pathsep),
+    loaded once per process.
+    """
+    tsv_path = tsv_path or os.getenv("LOCAL_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATHS)
+    if tsv_path not in _dictionaries:
+        _dictionaries[tsv_path] = DictionaryChain(
+            [open_dictionary(path) for path in tsv_path.split(os.pathsep) if path]
+        )
+    return _dictionaries[tsv_path]
+
+
+if __name__ == "__main__":
+    # python -m app.services.dictionary words.tsv [words.idx]
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else _index_path_for(source)
+    build_index(source, target)
+    print(f"Wrote {len(LocalDictionary(target))} entries to {target}")
@@ -0,0 +1,134 @@
+"""
+Embedding providers: turn a word and its meaning into a unit-length vector.
+
+Providers (EMBEDDING_PROVIDER):
+- "local" (default): deterministic feature hashing of the word's character
+  n-grams and the words of its meaning. Needs no network or model, gives
+  the same vector for the same input in every process, and is what tests
+  and offline development use.
+- "openai": OpenAI embeddings (EMBEDDING_MODEL), truncated to
+  EMBEDDING_DIMENSIONS and re-normalized.
+
+Vectors from different providers are not comparable; the similarity index
+only loads vectors made by the configured provider.
+"""
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.llm_scheduler import PRIORITY_INTERACTIVE
+from app.services.llm_service import create_embeddings
+
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "256"))
+
+# Weight of the meaning relative to the spelling in local vectors
+MEANING_WEIGHT = 2.5
+TOKEN_RE = re.compile(r"[a-z]+")
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been being by for from has have in into is it its
+    of on or something someone that the their to was were which who with
+    """.split()
+)
+
+
+def embedding_text(word: str, meaning: Optional[str]) -> str:
+    """The text embedded for a word."""
+    return f"{word}: {meaning}" if meaning else word
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (all-zero rows are left as they are)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<f4")
+
+
+class EmbeddingProvider:
+    name = "base"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    async def embed(self, texts: List[str], priority: int = PRIORITY_INTERACTIVE) -> np.ndarray:
+        """Return a (len(texts), dimensions) float32 array of unit vectors."""
+        raise NotImplementedError
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Feature hashing: words with similar spelling or meanings end up close."""
+
+    name = "local"
+
+    def _add(self, vector: np.ndarray, feature: str, weight: float) -> None:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        # The low bit picks the sign, so unrelated features cancel out on average
+        vector[(digest >> 1) % self.dimensions] += weight if digest & 1 else -weight
+
+    def embed_one(self, text: str) -> np.ndarray:
+        word, _, meaning = text.lower().partition(":")
+        word = word.strip()
+
+        spelling = np.zeros(self.dimensions, dtype=np.float32)
+        padded = f"<{word}>"
+        for n in (3, 4):
+            for i in range(len(padded) - n + 1):
+                self._add(spelling, f"c:{padded[i:i + n]}", 1.0)
+
+        sense = np.zeros(self.dimensions, dtype=np.float32)
+        for token in TOKEN_RE.findall(meaning):
+            if token in STOPWORDS or token == word:
+                continue
+            self._add(sense, f"w:{token}", 1.0)
+            if len(token) > 5:
+                # Crude stemming: "persuade" and "persuasive" share "persu"
+                self._add(sense, f"p:{token[:5]}", 0.5)
+
+        spelling, sense = normalize(np.stack([spelling, sense]))
+        return spelling + MEANING_WEIGHT * sense
+
+    async def embed(self, texts: List[str], priority: int = PRIORITY_INTERACTIVE) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return normalize(np.stack([self.embed_one(text) for text in texts]))
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI embeddings; text-embedding-3 vectors keep their meaning when truncated."""
+
+    name = "openai"
+
+    async def embed(self, texts: List[str], priority: int = PRIORITY_INTERACTIVE) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        vectors = np.asarray(await create_embeddings(texts, priority=priority), dtype=np.float32)
+        return normalize(vectors[:, : self.dimensions])
+
+
+PROVIDERS = {
+    LocalEmbeddingProvider.name: LocalEmbeddingProvider,
+    OpenAIEmbeddingProvider.name: OpenAIEmbeddingProvider,
+}
+
+_providers: Dict[str, EmbeddingProvider] = {}
+
+
+def get_embedding_provider(name: Optional[str] = None) -> EmbeddingProvider:
+    """The configured embedding provider, created once per process."""
+    name = name or os.getenv("EMBEDDING_PROVIDER", "local")
+    if name not in _providers:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown embedding provider: {name}")
+        _providers[name] = PROVIDERS[name]()
+    return _providers[name]
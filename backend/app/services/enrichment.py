@@ -0,0 +1,117 @@
+"""
+Enrichment provider chain: fills in a word's meaning and example sentences.
+
+Providers are tried in order (ENRICHMENT_PROVIDERS, default
+"dictionary,llm"); each one only has to supply the fields still missing.
+With the default chain, the bundled offline dictionary answers definitions
+instantly and the LLM is only asked for what is left: example sentences,
+or everything for words the dictionary does not know.
+
+Ingestion enriches with `defer_sentences=True`: a word the dictionary
+defines becomes ready at once, without waiting on (or failing with) the
+LLM, and its sentences are filled in later by
+`word_service.fill_missing_sentences`.
+"""
+import os
+from typing import Dict, List, Optional
+from app.services.dictionary import get_dictionary
+from app.services.llm_scheduler import LLMUnavailableError, PRIORITY_INTERACTIVE
+from app.services.llm_service import generate_word_data, generate_example_sentences
+
+FIELDS = ("meaning", "example_sentence_1", "example_sentence_2")
+
+
+class WordNotFoundError(LLMUnavailableError):
+    """No provider in the chain could define the word."""
+
+
+class EnrichmentProvider:
+    name = "base"
+
+    async def enrich(self, word: str, known: Dict[str, str], priority: int) -> Dict[str, str]:
+        """Return any of FIELDS this provider can supply for the word."""
+        raise NotImplementedError
+
+
+class LocalDictionaryProvider(EnrichmentProvider):
+    """Offline lookups in the bundled (or LOCAL_DICTIONARY_PATH) dictionaries."""
+
+    name = "dictionary"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+
+    async def enrich(self, word: str, known: Dict[str, str], priority: int) -> Dict[str, str]:
+        entry = get_dictionary(self.path).lookup(word)
+        if not entry:
+            return {}
+        return {field: value for field, value in entry.items() if value}
+
+
+class LLMProvider(EnrichmentProvider):
+    """OpenAI, asked only for the fields earlier providers left empty."""
+
+    name = "llm"
+
+    async def enrich(self, word: str, known: Dict[str, str], priority: int) -> Dict[str, str]:
+        if known.get("meaning"):
+            return await generate_example_sentences(word, known["meaning"], priority=priority)
+        return await generate_word_data(word, priority=priority)
+
+
+PROVIDERS = {
+    LocalDictionaryProvider.name: LocalDictionaryProvider,
+    LLMProvider.name: LLMProvider,
+}
+
+_chain: Optional[List[EnrichmentProvider]] = None
+
+
+def get_provider_chain() -> List[EnrichmentProvider]:
+    """The configured providers, built once per process."""
+    global _chain
+    if _chain is None:
+        names = os.getenv("ENRICHMENT_PROVIDERS", "dictionary,llm")
+        chain = []
+        for name in names.split(","):
+            name = name.strip()
+            if not name:
+                continue
+            if name not in PROVIDERS:
+                raise ValueError(f"Unknown enrichment provider: {name}")
+            chain.append(PROVIDERS[name]())
+        _chain = chain
+    return _chain
+
+
+async def enrich_word(
+    word: str,
+    priority: int = PRIORITY_INTERACTIVE,
+    providers: Optional[List[EnrichmentProvider]] = None,
+    known: Optional[Dict[str, str]] = None,
+    defer_sentences: bool = False,
+) -> Dict[str, Optional[str]]:
+    """
+    Run the provider chain for a word.
+    Returns a dict with meaning, example_sentence_1 and example_sentence_2
+    (sentences may be None if no provider supplied them). Fields in `known`
+    are kept and not asked for again. With `defer_sentences`, the chain
+    stops as soon as a meaning is known. Raises WordNotFoundError if no
+    provider knows the meaning, or LLMUnavailableError if the LLM was
+    needed and failed.
+    """
+    data: Dict[str, str] = {field: value for field, value in (known or {}).items() if value}
+    for provider in providers if providers is not None else get_provider_chain():
+        if all(data.get(field) for field in FIELDS):
+            break
+        if defer_sentences and data.get("meaning"):
+            break
+        result = await provider.enrich(word, dict(data), priority)
+        for field in FIELDS:
+            if result.get(field) and not data.get(field):
+                data[field] = result[field]
+
+    if not data.get("meaning"):
+        raise WordNotFoundError(f"No enrichment provider could define {word!r}")
+
+    return {field: data.get(field) for field in FIELDS}
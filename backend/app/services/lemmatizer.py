@@ -0,0 +1,304 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# Irregular or otherwise unruly forms that the suffix rules below would get wrong.
+EXCEPTIONS: Dict[str, str] = {
+    "analyses": "analysis",
+    "crises": "crisis",
+    "hypotheses": "hypothesis",
+    "theses": "thesis",
+    "syntheses": "synthesis",
+    "criteria": "criterion",
+    "phenomena": "phenomenon",
+    "strata": "stratum",
+    "curricula": "curriculum",
+    "children": "child",
+    "women": "woman",
+    "feet": "foot",
+    "teeth": "tooth",
+    "mice": "mouse",
+    "geese": "goose",
+    "knives": "knife",
+    "lives": "life",
+    "wives": "wife",
+    "leaves": "leaf",
+    "thieves": "thief",
+    "halves": "half",
+    "selves": "self",
+    "shelves": "shelf",
+    "wolves": "wolf",
+    "taught": "teach",
+    "thought": "think",
+    "brought": "bring",
+    "bought": "buy",
+    "sought": "seek",
+    "fought": "fight",
+    "caught": "catch",
+    "wrought": "work",
+    "forsook": "forsake",
+    "forsaken": "forsake",
+    "forgave": "forgive",
+    "forgiven": "forgive",
+    "undertook": "undertake",
+    "undertaken": "undertake",
+    "overcame": "overcome",
+    "arose": "arise",
+    "arisen": "arise",
+    "strove": "strive",
+    "striven": "strive",
+    "begun": "begin",
+    "began": "begin",
+    "written": "write",
+    "wrote": "write",
+    "spoken": "speak",
+    "spoke": "speak",
+    "chosen": "choose",
+    "chose": "choose",
+    "driven": "drive",
+    "drove": "drive",
+    "given": "give",
+    "taken": "take",
+    "shaken": "shake",
+    "stolen": "steal",
+    "frozen": "freeze",
+    "froze": "freeze",
+    "hidden": "hide",
+    "ridden": "ride",
+    "risen": "rise",
+    "fallen": "fall",
+    "swollen": "swell",
+    "shown": "show",
+    "known": "know",
+    "grown": "grow",
+    "thrown": "throw",
+    "flown": "fly",
+    "drawn": "draw",
+    "withdrawn": "withdraw",
+    "withdrew": "withdraw",
+    "held": "hold",
+    "upheld": "uphold",
+    "withheld": "withhold",
+    "built": "build",
+    "dwelt": "dwell",
+    "swept": "sweep",
+    "wept": "weep",
+    "slept": "sleep",
+    "kept": "keep",
+    "felt": "feel",
+    "dealt": "deal",
+    "meant": "mean",
+    "lent": "lend",
+    "sent": "send",
+    "spent": "spend",
+    "bent": "bend",
+    "fled": "flee",
+    "bled": "bleed",
+    "bred": "breed",
+    "misled": "mislead",
+    "stood": "stand",
+    "understood": "understand",
+    "withstood": "withstand",
+    "struck": "strike",
+    "stricken": "strike",
+    "clung": "cling",
+    "flung": "fling",
+    "stung": "sting",
+    "swung": "swing",
+    "wrung": "wring",
+    "sang": "sing",
+    "sung": "sing",
+    "sank": "sink",
+    "sunk": "sink",
+    "shrank": "shrink",
+    "shrunk": "shrink",
+    "dying": "die",
+    "lying": "lie",
+    "tying": "tie",
+    "vying": "vie",
+    "eyed": "eye",
+    "dyed": "dye",
+    "created": "create",
+    "creating": "create",
+    "changed": "change",
+    "changing": "change",
+    "goes": "go",
+    "going": "go",
+    "undergoes": "undergo",
+    "does": "do",
+    "doing": "do",
+    "undoes": "undo",
+    "shoes": "shoe",
+    "canoes": "canoe",
+}
+
+# Words that merely look inflected; they are returned unchanged.
+INVARIANT: Set[str] = {
+    # -s
+    "always", "perhaps", "news", "series", "species", "means", "lens",
+    "bias", "chaos", "ethos", "pathos", "logos", "kudos", "atlas", "canvas",
+    "alias", "bonus", "census", "campus", "virus", "status", "apparatus",
+    "impetus", "hiatus", "nexus", "onus", "plus", "thus", "gas", "yes",
+    "whereas", "aegis", "precis", "debris", "chassis", "corps", "physics",
+    "ethics", "politics", "economics", "mathematics", "aesthetics",
+    "linguistics", "athletics", "acoustics", "tactics", "analytics",
+    "diabetes", "herpes", "rabies", "scabies", "hermes", "sometimes",
+    "besides", "towards", "afterwards", "nevertheless", "nonetheless",
+    "regardless", "unless", "across", "mattress",
+    # -ed
+    "indeed", "exceed", "proceed", "succeed", "concede", "creed", "greed",
+    "breed", "bleed", "freed", "heed", "speed", "steed", "tweed", "seed",
+    "weed", "deed", "feed", "need", "reed", "shed", "sled", "shred",
+    "hundred", "kindred", "sacred", "naked", "wicked", "rugged", "ragged",
+    "jagged", "crooked", "wretched", "beloved", "learned", "aged",
+    "blessed", "dogged", "hatred", "infrared", "embed", "watershed",
+    "wed", "bred", "fled", "sped", "misled",
+    # -ing
+    "thing", "nothing", "something", "anything", "everything", "during",
+    "morning", "evening", "ceiling", "awning", "pudding", "herring",
+    "wedding", "bedding", "stuffing", "viking", "pending", "notwithstanding",
+    "lightning", "sibling", "darling", "shilling", "farthing", "inkling",
+    "offspring", "hireling", "underling", "nestling", "fledgling",
+    "seedling", "sapling", "duckling", "dumpling", "gosling", "lording",
+    "cunning", "bring", "string", "spring", "swing", "sling",
+    "sting", "cling", "fling", "wring", "king", "ring", "sing", "wing",
+    "ping", "ding", "zing", "building", "feeling", "meaning", "being",
+}
+
+VOWELS = set("aeiou")
+
+# Stem endings that almost always lost a silent "e" when -ed/-ing was added
+# ("abat" -> "abate", "realiz" -> "realize", "receiv" -> "receive",
+# "caus" -> "cause", "argu" -> "argue").
+E_RESTORE_ENDINGS = (
+    "at", "iz", "ys", "yz", "bl", "cl", "dl", "gl", "kl", "pl", "tl", "zl",
+    "v", "c", "ur", "ud", "ut", "ag", "ip", "ir", "ot", "ok", "ib", "in",
+    "ul", "ol", "ar", "os", "ng", "rg", "dg", "ps", "rs", "ns", "uid", "uad",
+    "us", "id", "um", "u",
+)
+# Stem endings that never take the "e" back, even if they match above.
+E_RESTORE_BLOCKERS = (
+    "eat", "oat", "ait", "ain", "oin", "ein", "eur", "our", "ear",
+    "oar", "air", "eir", "ook", "eek", "oot", "ool", "eol", "oal", "ing",
+    "ong", "ung", "ang", "aim", "oup", "eep", "oop", "ocus", "oid", "aid",
+    "eid", "uum", "uin",
+)
+
+_DOUBLE_CONSONANT = re.compile(r"([bdfgklmnprstvz])\1$")
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(ch in VOWELS for ch in stem) or (len(stem) > 2 and "y" in stem[1:])
+
+
+def _is_short_syllable(stem: str) -> bool:
+    """
+    One syllable ending consonant-vowel-consonant ("hop", "tim").
+    Such stems double their consonant when the base has no silent "e"
+    ("hop" -> "hopped"), so an undoubled one comes from "hope", "time".
+    """
+    if len(stem) < 3 or stem[-1] in VOWELS or stem[-1] in "wxy":
+        return False
+    if stem[-2] not in VOWELS | {"y"} or stem[-3] in VOWELS:
+        return False
+    return len(re.findall(r"[aeiou]+", stem[:-2])) == 0
+
+
+def _restore_stem(stem: str) -> str:
+    """Undo consonant doubling or silent-e loss on an -ed/-ing stem."""
+    if _DOUBLE_CONSONANT.search(stem) and len(stem) > 3:
+        return stem[:-1]
+    if stem.endswith(E_RESTORE_BLOCKERS):
+        return stem
+    if stem.endswith(E_RESTORE_ENDINGS) or _is_short_syllable(stem):
+        return stem + "e"
+    return stem
+
+
+def candidates(word: str) -> List[str]:
+    """
+    Return possible lemmas for a (lowercase) word, most likely first.
+    The word itself is always the last candidate.
+    """
+    word = word.lower().strip()
+    if word in EXCEPTIONS:
+        return [EXCEPTIONS[word], word]
+    if word in INVARIANT or len(word) < 4:
+        return [word]
+
+    found: List[str] = []
+
+    def add(stem: str) -> None:
+        if len(stem) >= 3 and _has_vowel(stem) and stem not in found and stem != word:
+            found.append(stem)
+
+    if word.endswith("ies") and len(word) > 4:
+        add(word[:-3] + "y")
+    elif word.endswith("sses"):
+        add(word[:-2])
+    elif word.endswith(("ches", "shes", "xes", "zes")):
+        add(word[:-2])
+        add(word[:-1])
+    elif word.endswith("oes"):
+        add(word[:-2])  # "heroes", "vetoes"
+        add(word[:-1])
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is", "ous")):
+        add(word[:-1])
+    elif word.endswith("ied") and len(word) > 4:
+        add(word[:-3] + "y")
+    elif word.endswith("eed"):
+        add(word[:-1])
+    elif word.endswith(("ed", "ing")):
+        stem = word[:-2] if word.endswith("ed") else word[:-3]
+        add(_restore_stem(stem))
+        add(stem + "e")
+        if not _is_short_syllable(stem):
+            # "hoped" is never "hop"; that would be spelled "hopped"
+            add(stem)
+
+    found.append(word)
+    return found
+
+
+def lemmatize(word: str, vocabulary: Optional[Set[str]] = None) -> str:
+    """
+    Reduce an inflected form to its lemma ("abating" -> "abate").
+
+    When a vocabulary of already-known lemmas is given, a word in it stays
+    as it is (a known "hackneyed" is not cut down to a known "hackney"),
+    then the first candidate found in it wins, and context beats the
+    suffix heuristics.
+    """
+    options = candidates(word)
+    if vocabulary:
+        for option in options[-1:] + options[:-1]:
+            if option in vocabulary:
+                return option
+    return options[0]
+
+
+def group_by_lemma(
+    words: Iterable[str], known: Optional[Set[str]] = None
+) -> Dict[str, List[str]]:
+    """
+    Collapse a batch of surface forms into {lemma: [surface forms]}.
+
+    A form in `known` (words already in the database, dictionary
+    headwords) is its own lemma, even when a stem of it is known too
+    ("hackneyed", not "hackney"). Otherwise it is only collapsed onto an
+    attested base: a lemma in `known`, which wins first, or a base form
+    seen in the same batch ("abate" next to "abated"). Failing both, the
+    form is its own lemma, since the suffix heuristics alone also produce
+    non-words ("unprecedented" -> "unprecedent").
+    """
+    surface = sorted({w.lower().strip() for w in words if w})
+    batch = set(surface)
+    known = known or set()
+    groups: Dict[str, List[str]] = {}
+    for form in surface:
+        options = candidates(form)
+        lemma = next((option for option in options[-1:] + options[:-1] if option in known), None)
+        if lemma is None:
+            # The form itself is always in the batch; only its bases count
+            lemma = next((option for option in options[:-1] if option in batch), form)
+        groups.setdefault(lemma, []).append(form)
+    return groups
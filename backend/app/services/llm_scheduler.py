@@ -0,0 +1,267 @@
+"""
+Scheduling for LLM calls: rate limiting, retries and circuit breaking.
+
+All calls to the model go through `LLMScheduler.run`, which:
+1) waits for room in a request bucket and a token bucket, serving
+   interactive callers before bulk ingestion,
+2) retries rate limits and transient errors with exponential backoff and
+   full jitter, honoring the provider's Retry-After header,
+3) adapts to the provider's actual limits: a rate-limited call halves the
+   bucket rates (down to MIN_RATE_FRACTION of the configured ones) and
+   pauses them for Retry-After, and each success adds back a little,
+4) trips a circuit breaker after repeated failures so bulk work pauses
+   instead of hammering a degraded provider.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# Rate adaptation: multiplicative decrease on a rate limit, additive increase
+# per successful call, never below this share of the configured rate
+RATE_DECREASE = 0.5
+RATE_INCREASE = 0.02
+MIN_RATE_FRACTION = 0.1
+
+
+class LLMUnavailableError(Exception):
+    """The model could not produce a result; the caller should retry later."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """The circuit breaker is open; no calls are made until it cools down."""
+
+
+class RetryableError(Exception):
+    """
+    Raised by a call to request a retry, optionally after a given delay.
+    `rate_limited` marks a rate limit (HTTP 429), which also slows the buckets.
+    """
+
+    def __init__(
+        self, message: str, retry_after: Optional[float] = None, rate_limited: bool = False
+    ):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.configured_rate = rate_per_minute / 60.0
+        self.rate = self.configured_rate
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Remove tokens; a negative balance is paid back by later refills."""
+        self._refill()
+        self.tokens -= amount
+
+    def slow_down(self, pause: Optional[float] = None) -> None:
+        """Cut the rate after a rate limit, and hand out nothing for `pause` seconds."""
+        self._refill()
+        self.rate = max(self.configured_rate * MIN_RATE_FRACTION, self.rate * RATE_DECREASE)
+        if pause:
+            self.tokens = min(self.tokens, 0.0) - pause * self.rate
+
+    def speed_up(self) -> None:
+        """Move the rate back towards the configured one after a success."""
+        if self.rate < self.configured_rate:
+            self._refill()
+            self.rate = min(self.configured_rate, self.rate + self.configured_rate * RATE_INCREASE)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures, for `cooldown` seconds."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now."""
+        if self.opened_at is None:
+            return
+        remaining = self.retry_after()
+        if remaining > 0 or self.probing:
+            raise CircuitOpenError(
+                "LLM provider is degraded, pausing calls",
+                retry_after=remaining or self.cooldown,
+            )
+        # Half-open: let a single probe through
+        self.probing = True
+
+    def cancel_probe(self) -> None:
+        """The probe never completed (e.g. it was cancelled); allow another."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # The worker runs each job in a fresh event loop; primitives can't be shared
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._waiters = []
+        return self._condition
+
+    async def acquire(self, estimated_tokens: int, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Wait for room in both buckets; lower priority values go first."""
+        condition = self._get_condition()
+        entry = (priority, next(self._sequence))
+        async with condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    if self._waiters[0] == entry:
+                        delay = max(
+                            self.requests.delay_for(1),
+                            self.tokens.delay_for(estimated_tokens),
+                        )
+                        if delay <= 0:
+                            heapq.heappop(self._waiters)
+                            self.requests.take(1)
+                            self.tokens.take(estimated_tokens)
+                            condition.notify_all()
+                            return
+                        try:
+                            await asyncio.wait_for(condition.wait(), delay)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await condition.wait()
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    condition.notify_all()
+                raise
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage is known."""
+        self.tokens.take(actual_tokens - estimated_tokens)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> T:
+        """
+        Run `call` under the rate limits, retrying on RetryableError.
+        Raises LLMUnavailableError when retries are exhausted or the
+        circuit is open.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                await self.acquire(estimated_tokens, priority)
+                result = await call()
+            except RetryableError as e:
+                if e.rate_limited:
+                    self.requests.slow_down(e.retry_after)
+                    self.tokens.slow_down(e.retry_after)
+                self.breaker.record_failure()
+                if attempt == self.max_retries or self.breaker.is_open:
+                    raise LLMUnavailableError(
+                        f"LLM call failed after {attempt + 1} attempts: {e}",
+                        retry_after=self.breaker.retry_after() or e.retry_after,
+                    ) from e
+                await asyncio.sleep(self.backoff(attempt, e.retry_after))
+                continue
+            except Exception:
+                # The provider answered; the request itself was bad
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                # Cancelled while waiting or mid-call; a half-open breaker
+                # must not stay stuck waiting for this probe
+                self.breaker.cancel_probe()
+                raise
+            self.breaker.record_success()
+            self.requests.speed_up()
+            self.tokens.speed_up()
+            return result
+
+        raise LLMUnavailableError("LLM call failed")
@@ -1,17 +1,134 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+import openai
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from typing import List, Optional
+from app.services.llm_scheduler import (
+    LLMScheduler,
+    LLMUnavailableError,
+    RetryableError,
+    PRIORITY_INTERACTIVE,
+)
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+_client: Optional[AsyncOpenAI] = None
+_client_loop = None
 
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+LLM_MAX_TOKENS = 300
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
 
-async def generate_word_data(word: str) -> dict:
+# The buckets are per process; the provider's limits are split between the
+# LLM_PROCESS_COUNT processes calling it (API instances, workers, seed CLI)
+LLM_PROCESS_COUNT = max(1, int(os.getenv("LLM_PROCESS_COUNT", "1")))
+
+scheduler = LLMScheduler(
+    requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")) / LLM_PROCESS_COUNT,
+    tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "40000")) / LLM_PROCESS_COUNT,
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "5")),
+    backoff_base=float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1")),
+    backoff_max=float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30")),
+    breaker_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+    breaker_cooldown=float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30")),
+)
+
+
+def get_client() -> AsyncOpenAI:
+    """The OpenAI client for the running event loop (the worker uses one per job)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        # Retries are handled by the scheduler, not the SDK
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+        _client_loop = loop
+    return _client
+
+
+def _retry_after(error: openai.APIStatusError) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from a provider error."""
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def _complete(messages: list) -> "openai.types.chat.ChatCompletion":
+    """One chat completion, with transient provider errors marked retryable."""
+    try:
+        return await get_client().chat.completions.create(
+            model=LLM_MODEL,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=LLM_MAX_TOKENS,
+        )
+    except openai.RateLimitError as e:
+        raise RetryableError(str(e), retry_after=_retry_after(e), rate_limited=True) from e
+    except openai.InternalServerError as e:
+        raise RetryableError(str(e), retry_after=_retry_after(e)) from e
+    except (openai.APIConnectionError, openai.APITimeoutError) as e:
+        raise RetryableError(str(e)) from e
+
+
+async def _embed(texts: List[str]) -> "openai.types.CreateEmbeddingResponse":
+    """One embeddings request, with transient provider errors marked retryable."""
+    try:
+        return await get_client().embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    except openai.RateLimitError as e:
+        raise RetryableError(str(e), retry_after=_retry_after(e), rate_limited=True) from e
+    except openai.InternalServerError as e:
+        raise RetryableError(str(e), retry_after=_retry_after(e)) from e
+    except (openai.APIConnectionError, openai.APITimeoutError) as e:
+        raise RetryableError(str(e)) from e
+
+
+async def _generate_json(prompt: str, word: str, priority: int) -> dict:
+    """Run a prompt through the scheduler and parse the JSON answer."""
+    messages = [
+        {
+            "role": "system",
+            "content": "You are an SAT vocabulary tutor. Always return valid JSON.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+    # Rough estimate (4 characters per token) plus the completion budget
+    estimated_tokens = sum(len(m["content"]) for m in messages) // 4 + LLM_MAX_TOKENS
+
+    try:
+        response = await scheduler.run(
+            lambda: _complete(messages), estimated_tokens, priority=priority
+        )
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        raise LLMUnavailableError(f"Error generating word data: {e}") from e
+
+    if response.usage is not None:
+        scheduler.record_usage(estimated_tokens, response.usage.total_tokens)
+
+    content = response.choices[0].message.content.strip()
+
+    # Try to extract JSON from the response
+    # Sometimes the model returns markdown code blocks
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0].strip()
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0].strip()
+
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        raise LLMUnavailableError(f"Invalid JSON from model for {word!r}: {e}") from e
+
+
+async def generate_word_data(word: str, priority: int = PRIORITY_INTERACTIVE) -> dict:
     """
     Generate meaning and example sentences for a word using OpenAI.
     Returns a dict with meaning, sentence1, and sentence2.
+    Raises LLMUnavailableError if no usable answer could be obtained;
+    callers should keep the word pending and retry later.
     """
     prompt = f"""You are an SAT vocabulary tutor.
 
@@ -28,40 +145,70 @@ Return JSON:
 
 Word: {word}"""
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an SAT vocabulary tutor. Always return valid JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-        )
+    data = await _generate_json(prompt, word, priority)
+
+    if not data.get("meaning"):
+        raise LLMUnavailableError(f"No meaning returned for {word!r}")
+
+    return {
+        "meaning": data.get("meaning", ""),
+        "example_sentence_1": data.get("sentence1", ""),
+        "example_sentence_2": data.get("sentence2", ""),
+    }
+
+
+async def generate_example_sentences(
+    word: str, meaning: str, priority: int = PRIORITY_INTERACTIVE
+) -> dict:
+    """
+    Generate two example sentences for a word whose meaning is already known.
+    Returns a dict with example_sentence_1 and example_sentence_2.
+    """
+    prompt = f"""You are an SAT vocabulary tutor.
+
+Write two example sentences appropriate for a high school student that use
+the given word with the given meaning.
+
+Return JSON:
+{{
+  "sentence1": "",
+  "sentence2": ""
+}}
 
-        content = response.choices[0].message.content.strip()
+Word: {word}
+Meaning: {meaning}"""
 
-        # Try to extract JSON from the response
-        # Sometimes the model returns markdown code blocks
-        if "```json" in content:
-            content = content.split("```json")[1].split("```")[0].strip()
-        elif "```" in content:
-            content = content.split("```")[1].split("```")[0].strip()
+    data = await _generate_json(prompt, word, priority)
 
-        data = json.loads(content)
+    if not data.get("sentence1"):
+        raise LLMUnavailableError(f"No example sentences returned for {word!r}")
 
-        return {
-            "meaning": data.get("meaning", ""),
-            "example_sentence_1": data.get("sentence1", ""),
-            "example_sentence_2": data.get("sentence2", ""),
-        }
+    return {
+        "example_sentence_1": data.get("sentence1", ""),
+        "example_sentence_2": data.get("sentence2", ""),
+    }
+
+
+async def create_embeddings(
+    texts: List[str], priority: int = PRIORITY_INTERACTIVE
+) -> List[List[float]]:
+    """
+    Embed texts with OpenAI, through the same scheduler as completions.
+    Returns one vector per text, in order. Raises LLMUnavailableError on failure.
+    """
+    # Rough estimate (4 characters per token); embeddings have no completion
+    estimated_tokens = sum(len(text) for text in texts) // 4 + 1
+
+    try:
+        response = await scheduler.run(
+            lambda: _embed(texts), estimated_tokens, priority=priority
+        )
+    except LLMUnavailableError:
+        raise
     except Exception as e:
-        print(f"Error generating word data: {e}")
-        # Return default values on error
-        return {
-            "meaning": f"A vocabulary word: {word}",
-            "example_sentence_1": f"Example sentence using {word}.",
-            "example_sentence_2": f"Another example with {word}.",
-        }
+        raise LLMUnavailableError(f"Error creating embeddings: {e}") from e
+
+    if response.usage is not None:
+        scheduler.record_usage(estimated_tokens, response.usage.total_tokens)
+
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
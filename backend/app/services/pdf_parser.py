@@ -1,13 +1,14 @@
 import pdfplumber
 import re
-from typing import List
+from typing import Dict, List
 from io import BytesIO
+from app.services.lemmatizer import group_by_lemma
 
 
-def extract_words_from_pdf(file_content: bytes) -> List[str]:
+def extract_surface_words_from_pdf(file_content: bytes) -> List[str]:
     """
     Extract words from a PDF file.
-    Returns a list of unique words (cleaned and deduplicated).
+    Returns a list of unique words (cleaned and deduplicated) as they appear.
     """
     words = set()
     
@@ -33,3 +34,19 @@ def extract_words_from_pdf(file_content: bytes) -> List[str]:
         raise
     
     return sorted(list(words))
+
+
+def extract_word_forms_from_pdf(file_content: bytes) -> Dict[str, List[str]]:
+    """
+    Extract words from a PDF file, collapsed to their lemmas.
+    Returns {lemma: [surface forms]}, e.g. {"abate": ["abated", "abating"]}.
+    """
+    return group_by_lemma(extract_surface_words_from_pdf(file_content))
+
+
+def extract_words_from_pdf(file_content: bytes) -> List[str]:
+    """
+    Extract words from a PDF file.
+    Returns a sorted list of unique lemmas, so inflected forms are not repeated.
+    """
+    return sorted(extract_word_forms_from_pdf(file_content))
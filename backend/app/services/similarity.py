@@ -0,0 +1,243 @@
+"""
+In-memory similarity index over word embeddings.
+
+Every process keeps all vectors of the configured embedding provider in one
+contiguous float32 matrix (row-normalized, so cosine similarity is a single
+matrix-vector product) and answers top-k queries without touching the
+database. The matrix is loaded on first use and then kept current by:
+- `store_embeddings`, which upserts new vectors into `word_embeddings` and,
+  once this process has loaded its index, into the index too, and
+- `sync_index`, which at most every EMBEDDING_REFRESH_SECONDS pulls rows
+  other processes (the worker, the seed CLI) wrote since the last sync.
+
+50k words at 256 dimensions is about 50 MB and a top-10 query takes a few
+milliseconds (see benchmarks/similarity.py).
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.word import Word, WORD_STATUS_READY
+from app.models.word_embedding import WordEmbedding
+from app.services.embeddings import (
+    EmbeddingProvider,
+    embedding_text,
+    from_bytes,
+    get_embedding_provider,
+    to_bytes,
+)
+from app.services.llm_scheduler import PRIORITY_BULK
+
+# How often each process pulls embeddings written elsewhere
+EMBEDDING_REFRESH_SECONDS = float(os.getenv("EMBEDDING_REFRESH_SECONDS", "30"))
+# Rows are re-read this far behind the last sync, so a row committed late
+# with an earlier updated_at (clock skew, long transaction) is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+INITIAL_CAPACITY = 1024
+
+
+class SimilarityIndex:
+    """Unit vectors in a growable contiguous matrix, with cosine top-k."""
+
+    def __init__(self, dimensions: int, capacity: int = INITIAL_CAPACITY):
+        self.dimensions = dimensions
+        self._vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self._ids: List[uuid.UUID] = []
+        self._words: List[str] = []
+        self._rows: Dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+        # Sync state, see sync_index
+        self.synced_at: Optional[float] = None
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, word_id: uuid.UUID) -> bool:
+        return word_id in self._rows
+
+    def upsert(self, word_id: uuid.UUID, word: str, vector: np.ndarray) -> None:
+        """Add a word's vector, or replace it if the word is already indexed."""
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            raise ValueError(f"Expected a {self.dimensions}-dimensional vector, got {vector.shape}")
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+
+        with self._lock:
+            row = self._rows.get(word_id)
+            if row is None:
+                row = len(self._ids)
+                if row == len(self._vectors):
+                    # Double the capacity so appends stay amortized O(1)
+                    grown = np.zeros((2 * len(self._vectors), self.dimensions), dtype=np.float32)
+                    grown[:row] = self._vectors[:row]
+                    self._vectors = grown
+                self._ids.append(word_id)
+                self._words.append(word)
+                self._rows[word_id] = row
+            self._vectors[row] = vector
+
+    def similar(self, word_id: uuid.UUID, k: int = 10) -> List[Tuple[uuid.UUID, str, float]]:
+        """The k words closest to `word_id` as (id, word, cosine similarity), best first."""
+        with self._lock:
+            row = self._rows.get(word_id)
+            if row is None:
+                raise KeyError(word_id)
+            count = len(self._ids)
+            k = min(k, count - 1)
+            if k <= 0:
+                return []
+
+            scores = self._vectors[:count] @ self._vectors[row]
+            scores[row] = -np.inf  # never the word itself
+            # O(n) selection of the top k, then sort only those
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._ids[i], self._words[i], float(scores[i])) for i in top]
+
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """This process's index for the configured provider (empty until synced)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SimilarityIndex(get_embedding_provider().dimensions)
+    return _index
+
+
+def sync_index(db: Session, force: bool = False) -> SimilarityIndex:
+    """
+    Load embeddings written since the last sync into the process index.
+    The first call loads everything; later calls are skipped unless
+    EMBEDDING_REFRESH_SECONDS have passed (or `force` is set).
+    """
+    index = get_similarity_index()
+    if not force and index.synced_at is not None and time.monotonic() - index.synced_at < EMBEDDING_REFRESH_SECONDS:
+        return index
+
+    with _index_lock:
+        # Another thread may have just synced
+        if not force and index.synced_at is not None and time.monotonic() - index.synced_at < EMBEDDING_REFRESH_SECONDS:
+            return index
+
+        provider = get_embedding_provider()
+        stmt = (
+            select(WordEmbedding.word_id, Word.word, WordEmbedding.vector, WordEmbedding.updated_at)
+            .join(Word, Word.id == WordEmbedding.word_id)
+            .where(
+                WordEmbedding.provider == provider.name,
+                WordEmbedding.dimensions == index.dimensions,
+                Word.status == WORD_STATUS_READY,
+            )
+        )
+        if index.watermark is not None:
+            stmt = stmt.where(WordEmbedding.updated_at >= index.watermark - SYNC_OVERLAP)
+
+        watermark = index.watermark
+        for word_id, word, vector, updated_at in db.execute(stmt):
+            index.upsert(word_id, word, from_bytes(vector))
+            if updated_at is not None and (watermark is None or updated_at > watermark):
+                watermark = updated_at
+
+        index.watermark = watermark
+        index.synced_at = time.monotonic()
+    return index
+
+
+async def store_embeddings(
+    db: Session,
+    words: Iterable[Word],
+    priority: int = PRIORITY_BULK,
+    provider: Optional[EmbeddingProvider] = None,
+) -> int:
+    """
+    Embed ready words, save the vectors and add them to this process's index.
+    Returns the number of words embedded.
+    """
+    words = [word for word in words if word.status == WORD_STATUS_READY]
+    if not words:
+        return 0
+
+    provider = provider or get_embedding_provider()
+    vectors = await provider.embed(
+        [embedding_text(word.word, word.meaning) for word in words], priority=priority
+    )
+
+    now = datetime.utcnow()
+    stmt = pg_insert(WordEmbedding).values(
+        [
+            {
+                "word_id": word.id,
+                "provider": provider.name,
+                "dimensions": provider.dimensions,
+                "vector": to_bytes(vector),
+                "updated_at": now,
+            }
+            for word, vector in zip(words, vectors)
+        ]
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[WordEmbedding.word_id],
+            set_={
+                "provider": stmt.excluded.provider,
+                "dimensions": stmt.excluded.dimensions,
+                "vector": stmt.excluded.vector,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+    db.commit()
+
+    # Only processes that query the index (the API) ever load it; the worker
+    # and the CLI just write, and must not build up a copy of every vector
+    index = _index
+    if (
+        index is not None
+        and index.synced_at is not None
+        and provider.name == get_embedding_provider().name
+        and provider.dimensions == index.dimensions
+    ):
+        for word, vector in zip(words, vectors):
+            index.upsert(word.id, word.word, vector)
+    return len(words)
+
+
+async def embed_words_safely(db: Session, words: Iterable[Word], priority: int = PRIORITY_BULK) -> None:
+    """store_embeddings for ingestion paths: a failure never fails the word itself."""
+    try:
+        await store_embeddings(db, words, priority=priority)
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: could not store embeddings: {e}")
+
+
+def missing_embeddings(db: Session, limit: int, provider: Optional[EmbeddingProvider] = None) -> List[Word]:
+    """Ready words with no vector from the configured provider (for backfills)."""
+    provider = provider or get_embedding_provider()
+    current = select(WordEmbedding.word_id).where(
+        WordEmbedding.provider == provider.name,
+        WordEmbedding.dimensions == provider.dimensions,
+    )
+    return (
+        db.query(Word)
+        .filter(Word.status == WORD_STATUS_READY, Word.id.notin_(current))
+        .order_by(Word.created_at)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,185 @@
+"""
+Queue of words waiting for enrichment, shared by the API and the worker.
+
+Backends (WORD_QUEUE_BACKEND):
+- "sqs": Amazon SQS at SQS_QUEUE_URL, published with send_message_batch
+  in batches of 10. FIFO queues get content-based deduplication IDs.
+- "sqlite": a local SQLite file (WORD_QUEUE_SQLITE_PATH), so the API and
+  `python -m worker.worker` (from backend/) can run end-to-end without AWS.
+Defaults to "sqs" when SQS_QUEUE_URL is set, "sqlite" otherwise.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Dict, List, NamedTuple, Optional
+
+import boto3
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SQS_BATCH_SIZE = 10  # send_message_batch / receive_message maximum
+# Seconds a received message stays hidden before another worker may take it
+VISIBILITY_TIMEOUT = int(os.getenv("WORD_QUEUE_VISIBILITY_TIMEOUT", "300"))
+
+
+class QueueMessage(NamedTuple):
+    body: dict
+    receipt: str
+
+
+def dedup_id(body: dict) -> str:
+    """
+    Identical word jobs share an ID, so the queue can drop repeats. The
+    surface forms are part of it: a later upload with new forms of a queued
+    word is kept, and the worker records its forms once the word is ready.
+    """
+    forms = ",".join(sorted(set(body.get("forms") or [])))
+    return hashlib.sha256(f"word:{body['word']}|forms:{forms}".encode("utf-8")).hexdigest()
+
+
+class WordQueue:
+    def publish(self, bodies: List[dict]) -> List[dict]:
+        """
+        Enqueue word jobs; returns the ones the queue rejected.
+        Duplicates of jobs already queued count as accepted.
+        """
+        raise NotImplementedError
+
+    def receive(self, max_messages: int = SQS_BATCH_SIZE, wait_seconds: int = 20) -> List[QueueMessage]:
+        """Take up to `max_messages` jobs, waiting up to `wait_seconds` for one."""
+        raise NotImplementedError
+
+    def delete(self, message: QueueMessage) -> None:
+        """Acknowledge a job once it has been handled."""
+        raise NotImplementedError
+
+
+class SQSWordQueue(WordQueue):
+    def __init__(self, queue_url: str, client=None):
+        self.queue_url = queue_url
+        self.fifo = queue_url.endswith(".fifo")
+        self.client = client or boto3.client(
+            "sqs",
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+            region_name=os.getenv("AWS_REGION", "us-east-1"),
+        )
+
+    def publish(self, bodies: List[dict]) -> List[dict]:
+        rejected = []
+        for start in range(0, len(bodies), SQS_BATCH_SIZE):
+            batch = bodies[start:start + SQS_BATCH_SIZE]
+            entries = []
+            for i, body in enumerate(batch):
+                entry = {"Id": str(i), "MessageBody": json.dumps(body)}
+                if self.fifo:
+                    entry["MessageDeduplicationId"] = dedup_id(body)
+                    entry["MessageGroupId"] = entry["MessageDeduplicationId"][:16]
+                entries.append(entry)
+
+            response = self.client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+            for failure in response.get("Failed", []):
+                print(f"Warning: could not queue message {failure}")
+                rejected.append(batch[int(failure["Id"])])
+        return rejected
+
+    def receive(self, max_messages: int = SQS_BATCH_SIZE, wait_seconds: int = 20) -> List[QueueMessage]:
+        response = self.client.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=min(max_messages, SQS_BATCH_SIZE),
+            WaitTimeSeconds=wait_seconds,  # Long polling
+            VisibilityTimeout=VISIBILITY_TIMEOUT,
+        )
+        return [
+            QueueMessage(json.loads(message["Body"]), message["ReceiptHandle"])
+            for message in response.get("Messages", [])
+        ]
+
+    def delete(self, message: QueueMessage) -> None:
+        self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.receipt)
+
+
+class SQLiteWordQueue(WordQueue):
+    def __init__(self, path: str, poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS word_queue (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedup_id TEXT UNIQUE NOT NULL,
+                    body TEXT NOT NULL,
+                    visible_at REAL NOT NULL,
+                    receipt TEXT
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly where needed
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def publish(self, bodies: List[dict]) -> List[dict]:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO word_queue (dedup_id, body, visible_at) VALUES (?, ?, ?)",
+                [(dedup_id(body), json.dumps(body), now) for body in bodies],
+            )
+            conn.execute("COMMIT")
+        # Failures raise; ignored rows are identical jobs already queued
+        return []
+
+    def receive(self, max_messages: int = SQS_BATCH_SIZE, wait_seconds: int = 20) -> List[QueueMessage]:
+        deadline = time.monotonic() + wait_seconds
+        with closing(self._connect()) as conn:
+            while True:
+                now = time.time()
+                receipt = uuid.uuid4().hex
+                conn.execute("BEGIN IMMEDIATE")
+                rows = conn.execute(
+                    "SELECT id, body FROM word_queue WHERE visible_at <= ? ORDER BY id LIMIT ?",
+                    (now, max_messages),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE word_queue SET visible_at = ?, receipt = ? WHERE id = ?",
+                    [(now + VISIBILITY_TIMEOUT, f"{receipt}:{row_id}", row_id) for row_id, _ in rows],
+                )
+                conn.execute("COMMIT")
+
+                if rows or time.monotonic() >= deadline:
+                    return [
+                        QueueMessage(json.loads(body), f"{receipt}:{row_id}")
+                        for row_id, body in rows
+                    ]
+                time.sleep(self.poll_interval)
+
+    def delete(self, message: QueueMessage) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM word_queue WHERE receipt = ?", (message.receipt,))
+
+
+_queues: Dict[str, WordQueue] = {}
+
+
+def get_word_queue(backend: Optional[str] = None) -> WordQueue:
+    """The configured word queue, created once per process."""
+    sqs_queue_url = os.getenv("SQS_QUEUE_URL")
+    backend = backend or os.getenv("WORD_QUEUE_BACKEND") or ("sqs" if sqs_queue_url else "sqlite")
+    if backend not in _queues:
+        if backend == "sqs":
+            if not sqs_queue_url:
+                raise ValueError("SQS_QUEUE_URL must be set for the sqs word queue")
+            _queues[backend] = SQSWordQueue(sqs_queue_url)
+        elif backend == "sqlite":
+            _queues[backend] = SQLiteWordQueue(os.getenv("WORD_QUEUE_SQLITE_PATH", "word_queue.db"))
+        else:
+            raise ValueError(f"Unknown word queue backend: {backend}")
+    return _queues[backend]
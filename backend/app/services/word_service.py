@@ -1,36 +1,522 @@
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from app.models.word import Word
-from app.services.llm_service import generate_word_data
-from typing import Optional
+from app.models.word import Word, WORD_STATUS_PENDING, WORD_STATUS_READY
+from app.models.word_form import WordForm
+from app.services.dictionary import get_dictionary
+from app.services.enrichment import enrich_word
+from app.services.llm_scheduler import (
+    CircuitOpenError,
+    LLMUnavailableError,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+)
+from app.services.lemmatizer import candidates, group_by_lemma
+from app.services.similarity import embed_words_safely
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import os
 import uuid
 
+# A pending claim older than this is assumed abandoned and can be taken over
+CLAIM_TIMEOUT = timedelta(seconds=int(os.getenv("WORD_CLAIM_TIMEOUT_SECONDS", "120")))
+# How often to check on a word another process is enriching (seconds)
+CLAIM_POLL_INTERVAL = 0.5
+# Pending words that failed this many times are parked: retry_pending_words
+# skips them, though a new request for the word (e.g. an upload) still tries
+MAX_ENRICH_ATTEMPTS = int(os.getenv("WORD_MAX_ENRICH_ATTEMPTS", "5"))
+# Delay before the first automatic retry of a failed word, doubled per attempt
+RETRY_BACKOFF = timedelta(seconds=int(os.getenv("WORD_RETRY_BACKOFF_SECONDS", "60")))
+RETRY_BACKOFF_MAX = timedelta(hours=6)
 
-async def create_word_with_llm(db: Session, word_text: str, source: str = "manual") -> Word:
+# Enrichments running in this process: lemma -> future resolving to the word ID
+_in_flight: Dict[str, "asyncio.Future[uuid.UUID]"] = {}
+
+
+def get_word_by_text(db: Session, word_text: str) -> Optional[Word]:
+    """
+    Get a word by any of its forms ("abate", "abated", "abating", ...).
+    Checks recorded surface forms first, then the lemma candidates.
+    """
+    text = word_text.lower().strip()
+
+    form = db.query(WordForm).filter(WordForm.form == text).first()
+    if form:
+        return form.word
+
+    # The word itself first: a stored "hackneyed" beats a stored "hackney"
+    options = [text] + candidates(text)[:-1]
+    found = {w.word: w for w in db.query(Word).filter(Word.word.in_(options)).all()}
+    for option in options:
+        if option in found:
+            return found[option]
+    return None
+
+
+def group_forms(db: Session, surface_forms: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Group surface forms by lemma like `get_word_by_text` would resolve them:
+    recorded forms go to their word, then lemma candidates already stored
+    in `words` or defined by the offline dictionary. A form with no attested
+    base stays its own lemma (see `group_by_lemma`).
+    """
+    surface = {f.lower().strip() for f in surface_forms if f}
+    if not surface:
+        return {}
+
+    recorded = dict(
+        db.query(WordForm.form, Word.word)
+        .join(Word, Word.id == WordForm.word_id)
+        .filter(WordForm.form.in_(surface))
+        .all()
+    )
+    options = {option for form in surface for option in candidates(form)}
+    known = {word for (word,) in db.query(Word.word).filter(Word.word.in_(options)).all()}
+    dictionary = get_dictionary()
+    known.update(option for option in options if option in dictionary)
+
+    groups = group_by_lemma(surface - set(recorded), known)
+    for form, lemma in sorted(recorded.items()):
+        groups.setdefault(lemma, []).append(form)
+    return groups
+
+
+def record_word_forms(db: Session, word: Word, forms: Iterable[str]) -> None:
+    """Attach surface forms to a word, skipping the lemma and known forms."""
+    forms = {f.lower().strip() for f in forms if f} - {word.word}
+    if not forms:
+        return
+
+    # Another process may record the same form concurrently
+    db.execute(
+        pg_insert(WordForm)
+        .values([{"id": uuid.uuid4(), "form": form, "word_id": word.id} for form in sorted(forms)])
+        .on_conflict_do_nothing(index_elements=[WordForm.form])
+    )
+    db.commit()
+
+
+def record_forms_bulk(db: Session, forms_by_word_id: Dict[uuid.UUID, Iterable[str]]) -> None:
+    """Attach surface forms to many words in one statement."""
+    rows = [
+        {"id": uuid.uuid4(), "form": form, "word_id": word_id}
+        for word_id, forms in forms_by_word_id.items()
+        for form in sorted({f.lower().strip() for f in forms if f})
+    ]
+    if not rows:
+        return
+
+    db.execute(
+        pg_insert(WordForm)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[WordForm.form])
+    )
+    db.commit()
+
+
+def claim_word(db: Session, lemma: str, source: str) -> Tuple[Optional[uuid.UUID], datetime]:
+    """
+    Claim a lemma for enrichment across all processes.
+
+    Inserts a pending row with `ON CONFLICT DO NOTHING`; if the row already
+    exists, a pending claim older than CLAIM_TIMEOUT is taken over (its
+    owner is assumed dead). Returns (word ID if this caller owns the claim,
+    else None; claim time). Writes back match `claimed_at` against the
+    claim time, as with `claim_words`.
+    """
+    now = datetime.utcnow()
+    word_id = db.execute(
+        pg_insert(Word)
+        .values(
+            id=uuid.uuid4(),
+            word=lemma,
+            source=source,
+            status=WORD_STATUS_PENDING,
+            claimed_at=now,
+            created_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=[Word.word])
+        .returning(Word.id)
+    ).scalar()
+
+    if word_id is None:
+        word_id = db.execute(
+            update(Word)
+            .where(
+                Word.word == lemma,
+                Word.status == WORD_STATUS_PENDING,
+                or_(Word.claimed_at.is_(None), Word.claimed_at < now - CLAIM_TIMEOUT),
+            )
+            .values(claimed_at=now)
+            .returning(Word.id)
+        ).scalar()
+
+    db.commit()
+    return word_id, now
+
+
+def claim_words(
+    db: Session, lemmas: List[str], source: str
+) -> Tuple[Dict[str, uuid.UUID], datetime]:
+    """
+    Bulk `claim_word` for a batch of lemmas, in two statements.
+    Returns ({lemma: word ID} for the lemmas this caller now owns, claim
+    time). Lemmas that are ready, or pending under a live claim, are left
+    out. Writes back should match `claimed_at` against the claim time, so
+    a claim taken over after CLAIM_TIMEOUT is never overwritten.
+    """
+    now = datetime.utcnow()
+    if not lemmas:
+        return {}, now
+
+    claimed = dict(
+        db.execute(
+            pg_insert(Word)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "word": lemma,
+                        "source": source,
+                        "status": WORD_STATUS_PENDING,
+                        "claimed_at": now,
+                        "created_at": now,
+                    }
+                    for lemma in lemmas
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Word.word])
+            .returning(Word.word, Word.id)
+        ).all()
+    )
+
+    existing = [lemma for lemma in lemmas if lemma not in claimed]
+    if existing:
+        claimed.update(
+            db.execute(
+                update(Word)
+                .where(
+                    Word.word.in_(existing),
+                    Word.status == WORD_STATUS_PENDING,
+                    or_(Word.claimed_at.is_(None), Word.claimed_at < now - CLAIM_TIMEOUT),
+                )
+                .values(claimed_at=now)
+                .returning(Word.word, Word.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+
+    db.commit()
+    return claimed, now
+
+
+def refresh_claims(db: Session, word_ids: Iterable[uuid.UUID], claimed_at: datetime) -> datetime:
+    """
+    Extend claims made at `claimed_at` (see `claim_words`) so they do not go
+    stale during long work. Returns the new claim time; claims somebody
+    already took over are left alone.
+    """
+    now = datetime.utcnow()
+    db.execute(
+        update(Word)
+        .where(
+            Word.id.in_(list(word_ids)),
+            Word.status == WORD_STATUS_PENDING,
+            Word.claimed_at == claimed_at,
+        )
+        .values(claimed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return now
+
+
+def release_claims(db: Session, word_ids: Iterable[uuid.UUID], claimed_at: datetime) -> None:
+    """Give up claims made at `claimed_at`; the words stay pending for a retry."""
+    db.execute(
+        update(Word)
+        .where(
+            Word.id.in_(list(word_ids)),
+            Word.status == WORD_STATUS_PENDING,
+            Word.claimed_at == claimed_at,
+        )
+        .values(claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+async def keep_claims(db: Session, word_ids: Iterable[uuid.UUID], claim: dict) -> None:
+    """
+    Refresh claims every third of CLAIM_TIMEOUT until cancelled, keeping
+    the current claim time in claim["claimed_at"]. Run it as a task next to
+    enrichment that may outlast the timeout (e.g. queued at bulk priority).
+    """
+    word_ids = list(word_ids)
+    while True:
+        await asyncio.sleep(CLAIM_TIMEOUT.total_seconds() / 3)
+        try:
+            claim["claimed_at"] = refresh_claims(db, word_ids, claim["claimed_at"])
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: could not refresh claims: {e}")
+
+
+async def wait_for_word(db: Session, lemma: str) -> Optional[Word]:
+    """
+    Wait for another process to finish enriching a lemma.
+    Returns the ready word, or None once the claim is gone or stale.
+    """
+    while True:
+        db.expire_all()
+        word = db.query(Word).filter(Word.word == lemma).first()
+        if word is None:
+            return None
+        if word.status == WORD_STATUS_READY:
+            return word
+        if word.claimed_at is None or word.claimed_at < datetime.utcnow() - CLAIM_TIMEOUT:
+            return None
+        await asyncio.sleep(CLAIM_POLL_INTERVAL)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Wait before the next automatic retry of a word that failed `attempts` times."""
+    return min(RETRY_BACKOFF * 2 ** max(attempts - 1, 0), RETRY_BACKOFF_MAX)
+
+
+def _release_claim(db: Session, word_id: uuid.UUID, claimed_at: datetime, count_attempt: bool) -> None:
+    """Release a failed claim; the word stays pending for a later retry."""
+    db.rollback()
+    values = {Word.claimed_at: None}
+    if count_attempt:
+        attempts = (db.query(Word.enrich_attempts).filter(Word.id == word_id).scalar() or 0) + 1
+        values[Word.enrich_attempts] = attempts
+        values[Word.next_retry_at] = datetime.utcnow() + retry_delay(attempts)
+    db.query(Word).filter(
+        Word.id == word_id,
+        Word.status == WORD_STATUS_PENDING,
+        # A claim taken over after CLAIM_TIMEOUT is no longer ours to release
+        Word.claimed_at == claimed_at,
+    ).update(values, synchronize_session=False)
+    db.commit()
+
+
+def _store_claimed(db: Session, word_id: uuid.UUID, claimed_at: datetime, data: dict) -> bool:
+    """Make a claimed word ready. False if the claim was taken over meanwhile."""
+    stored = db.query(Word).filter(
+        Word.id == word_id,
+        Word.status == WORD_STATUS_PENDING,
+        Word.claimed_at == claimed_at,
+    ).update(
+        {
+            Word.meaning: data["meaning"],
+            Word.example_sentence_1: data["example_sentence_1"],
+            Word.example_sentence_2: data["example_sentence_2"],
+            Word.status: WORD_STATUS_READY,
+            Word.claimed_at: None,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+    return bool(stored)
+
+
+async def enrich_word_once(
+    db: Session, lemma: str, source: str, priority: int = PRIORITY_INTERACTIVE
+) -> Word:
+    """
+    Create a ready word for a lemma, enriching it at most once fleet-wide.
+    The claim is refreshed while enrichment runs and the result is only
+    written under it, so a takeover never writes the word twice.
+    If enrichment fails, the word is left pending (unclaimed) for a later
+    retry; failures other than an open circuit count towards
+    MAX_ENRICH_ATTEMPTS and push back its next automatic retry.
+    """
+    while True:
+        word_id, claimed_at = claim_word(db, lemma, source)
+        if word_id is not None:
+            break
+        word = await wait_for_word(db, lemma)
+        if word is not None:
+            return word
+
+    claim = {"claimed_at": claimed_at}
+    heartbeat = asyncio.create_task(keep_claims(db, [word_id], claim))
+    try:
+        # Dictionary-defined words are ready at once; see fill_missing_sentences
+        data = await enrich_word(lemma, priority=priority, defer_sentences=True)
+    except Exception as e:
+        # An open circuit is the provider's fault, not the word's
+        _release_claim(db, word_id, claim["claimed_at"], count_attempt=not isinstance(e, CircuitOpenError))
+        raise
+    finally:
+        heartbeat.cancel()
+
+    if not _store_claimed(db, word_id, claim["claimed_at"], data):
+        # Taken over after all (e.g. the heartbeat could not reach the
+        # database); the new owner's result wins
+        word = await wait_for_word(db, lemma)
+        if word is None:
+            raise LLMUnavailableError(f"Lost the claim on {lemma}; it is left pending")
+        return word
+
+    word = db.query(Word).filter(Word.id == word_id).one()
+
+    # Keep the similarity index current; a failure here leaves the word ready
+    await embed_words_safely(db, [word], priority=priority)
+
+    return word
+
+
+async def create_word_with_llm(
+    db: Session,
+    word_text: str,
+    source: str = "manual",
+    forms: Optional[Iterable[str]] = None,
+    priority: int = PRIORITY_INTERACTIVE,
+) -> Word:
     """
     Create a word and generate LLM data if not already exists.
+    The word is stored under its lemma; `word_text` and any extra `forms`
+    are recorded as surface forms so later lookups by them hit the same row.
+    When `forms` is given, `word_text` is taken to be the lemma already
+    (see `lemmatizer.group_by_lemma`).
+
+    Concurrent callers in this process share one in-flight enrichment per
+    lemma; other processes are coordinated through `claim_word`.
+    Raises LLMUnavailableError if the LLM fails; the word is then kept
+    pending and can be finished with `retry_pending_words`.
     """
-    # Check if word already exists
-    existing_word = db.query(Word).filter(Word.word == word_text.lower()).first()
+    text = word_text.lower().strip()
+    forms_given = forms is not None
+    forms = set(forms or []) | {text}
+
+    # Check if word already exists (under any form)
+    existing_word = get_word_by_text(db, text)
     if existing_word:
-        return existing_word
-    
-    # Generate LLM data
-    llm_data = await generate_word_data(word_text)
-    
-    # Create word
-    new_word = Word(
-        word=word_text.lower(),
-        meaning=llm_data["meaning"],
-        example_sentence_1=llm_data["example_sentence_1"],
-        example_sentence_2=llm_data["example_sentence_2"],
-        source=source,
-    )
-    
-    db.add(new_word)
-    db.commit()
-    db.refresh(new_word)
-    
-    return new_word
+        if existing_word.status == WORD_STATUS_READY:
+            record_word_forms(db, existing_word, forms)
+            return existing_word
+        lemma = existing_word.word
+    elif forms_given:
+        lemma = text
+    else:
+        # Only an attested base; an unknown "hackneyed" stays as it is
+        (lemma,) = group_forms(db, [text])
+
+    in_flight = _in_flight.get(lemma)
+    if in_flight is not None:
+        word_id = await asyncio.shield(in_flight)
+        db.expire_all()
+        word = db.query(Word).filter(Word.id == word_id).one()
+        record_word_forms(db, word, forms)
+        return word
+
+    future = asyncio.get_running_loop().create_future()
+    # Nobody may be waiting on a failed enrichment; don't warn about it
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _in_flight[lemma] = future
+    try:
+        word = await enrich_word_once(db, lemma, source, priority=priority)
+        future.set_result(word.id)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _in_flight.pop(lemma, None)
+
+    record_word_forms(db, word, forms)
+
+    return word
+
+
+async def retry_pending_words(
+    db: Session, limit: int = 10, priority: int = PRIORITY_BULK
+) -> int:
+    """
+    Retry enrichment for pending words nobody is working on whose next
+    retry is due, skipping words parked after MAX_ENRICH_ATTEMPTS.
+    Returns the number of words that became ready. A failing word does not
+    block the others; only an open circuit breaker stops the batch early.
+    """
+    now = datetime.utcnow()
+    stale_before = now - CLAIM_TIMEOUT
+    pending = (
+        db.query(Word.word, Word.source)
+        .filter(
+            Word.status == WORD_STATUS_PENDING,
+            or_(Word.claimed_at.is_(None), Word.claimed_at < stale_before),
+            Word.enrich_attempts < MAX_ENRICH_ATTEMPTS,
+            or_(Word.next_retry_at.is_(None), Word.next_retry_at <= now),
+        )
+        .order_by(Word.next_retry_at.nullsfirst(), Word.created_at)
+        .limit(limit)
+        .all()
+    )
+
+    finished = 0
+    for lemma, source in pending:
+        try:
+            await create_word_with_llm(db, lemma, source, forms=[], priority=priority)
+        except CircuitOpenError as e:
+            print(f"Retry of pending words paused: {e}")
+            break
+        except LLMUnavailableError as e:
+            print(f"Retry of pending word {lemma} failed: {e}")
+            continue
+        finished += 1
+    return finished
+
+
+async def fill_missing_sentences(
+    db: Session, limit: int = 10, priority: int = PRIORITY_BULK
+) -> int:
+    """
+    Add example sentences to ready words that were defined without them
+    (e.g. from the offline dictionary). Failures back off and count towards
+    MAX_ENRICH_ATTEMPTS like pending retries do; an open circuit breaker
+    stops the batch. Returns the number of words completed.
+    """
+    now = datetime.utcnow()
+    words = (
+        db.query(Word)
+        .filter(
+            Word.status == WORD_STATUS_READY,
+            Word.meaning.isnot(None),
+            Word.example_sentence_1.is_(None),
+            Word.enrich_attempts < MAX_ENRICH_ATTEMPTS,
+            or_(Word.next_retry_at.is_(None), Word.next_retry_at <= now),
+        )
+        .order_by(Word.next_retry_at.nullsfirst(), Word.created_at)
+        .limit(limit)
+        .all()
+    )
+
+    filled = 0
+    for word in words:
+        try:
+            data = await enrich_word(word.word, priority=priority, known={"meaning": word.meaning})
+        except CircuitOpenError as e:
+            print(f"Filling example sentences paused: {e}")
+            break
+        except LLMUnavailableError as e:
+            print(f"Example sentences for {word.word} failed: {e}")
+            data = {}
+
+        if data.get("example_sentence_1"):
+            word.example_sentence_1 = data["example_sentence_1"]
+            word.example_sentence_2 = data["example_sentence_2"]
+            word.next_retry_at = None
+            filled += 1
+        else:
+            word.enrich_attempts += 1
+            word.next_retry_at = datetime.utcnow() + retry_delay(word.enrich_attempts)
+        db.commit()
+    return filled
 
 
 def get_word_by_id(db: Session, word_id: uuid.UUID) -> Optional[Word]:
@@ -39,5 +525,11 @@ def get_word_by_id(db: Session, word_id: uuid.UUID) -> Optional[Word]:
 
 
 def get_all_words(db: Session, skip: int = 0, limit: int = 100):
-    """Get all words with pagination."""
-    return db.query(Word).offset(skip).limit(limit).all()
+    """Get all enriched words with pagination."""
+    return (
+        db.query(Word)
+        .filter(Word.status == WORD_STATUS_READY)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
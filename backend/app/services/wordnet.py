@@ -0,0 +1,148 @@
+"""
+Build the offline dictionary from Princeton WordNet 3.0.
+
+    python -m app.services.wordnet /path/to/wordnet/dict [app/data/wordnet.tsv]
+
+Reads WordNet's database files (index.noun, data.noun, ... as shipped in
+its "dict" directory, or nltk_data's corpora/wordnet) and writes a
+dictionary TSV in the format of `dictionary.parse_tsv`: for every
+single-word, lowercase lemma, the gloss of its most frequent sense and up
+to two of WordNet's usage examples that contain the word. This is how the
+bundled app/data/wordnet.tsv was made; WordNet's license is in
+app/data/WORDNET_LICENSE.
+"""
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Searched in this order when a lemma's parts of speech are equally common
+PARTS_OF_SPEECH = ("noun", "verb", "adj", "adv")
+EXAMPLES_PER_WORD = 2
+
+HEADWORD_RE = re.compile(r"[a-z]{2,}")
+EXAMPLE_RE = re.compile(r'"([^"]+)"')
+# Syntactic markers on adjectives, e.g. "galore(ip)"
+ADJ_MARKER_RE = re.compile(r"\([a-z]+\)$")
+
+HEADER = """# word\tmeaning\texample_sentence_1\texample_sentence_2
+# Generated by `python -m app.services.wordnet` from Princeton WordNet 3.0.
+# WordNet 3.0 Copyright 2006 by Princeton University. All rights reserved.
+# See WORDNET_LICENSE for the license terms.
+"""
+
+
+def read_index(path: str) -> Iterator[Tuple[str, int, List[int]]]:
+    """Yield (lemma, tagged sense count, synset offsets by frequency) from an index file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(" "):  # license header
+                continue
+            fields = line.split()
+            synset_count, pointer_count = int(fields[2]), int(fields[3])
+            rest = fields[4 + pointer_count:]
+            # rest: sense_cnt tagsense_cnt offset...
+            yield fields[0], int(rest[1]), [int(offset) for offset in rest[2:2 + synset_count]]
+
+
+def parse_synset(line: str) -> Tuple[List[str], str, List[str]]:
+    """Split a data file line into (words, definition, usage examples)."""
+    head, _, gloss = line.partition(" | ")
+    fields = head.split()
+    word_count = int(fields[3], 16)
+    words = [ADJ_MARKER_RE.sub("", fields[4 + 2 * i]) for i in range(word_count)]
+    definition = gloss.split('"', 1)[0].strip().rstrip(";").strip()
+    return words, definition, EXAMPLE_RE.findall(gloss)
+
+
+def uses_word(example: str, lemma: str) -> bool:
+    """Whether an example contains the lemma or an inflection of it."""
+    stem = lemma[:-1] if len(lemma) > 4 and lemma[-1] in "ey" else lemma
+    return re.search(rf"\b{re.escape(stem)}[a-z]*\b", example, re.IGNORECASE) is not None
+
+
+def as_sentence(example: str) -> str:
+    example = example.strip()
+    if example[-1] not in ".!?":
+        example += "."
+    return example[0].upper() + example[1:]
+
+
+def read_data(path: str) -> Dict[int, str]:
+    """
+    {synset offset: line} for a data file. Keyed by the offset field rather
+    than seeking to it, so copies with rewritten line endings still work.
+    """
+    synsets: Dict[int, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(" "):  # license header
+                continue
+            synsets[int(line.split(" ", 1)[0])] = line.rstrip("\r\n")
+    return synsets
+
+
+class WordNet:
+    """The synsets of a WordNet dict directory, by part of speech and offset."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._data = {pos: read_data(os.path.join(directory, f"data.{pos}")) for pos in PARTS_OF_SPEECH}
+
+    def synset(self, pos: str, offset: int) -> Tuple[List[str], str, List[str]]:
+        return parse_synset(self._data[pos][offset])
+
+    def entries(self) -> Dict[str, List[str]]:
+        """{lemma: [meaning, example 1, example 2]} for every lowercase single-word lemma."""
+        # lemma -> ((tagged senses, synsets, -part of speech order), pos, offsets)
+        best: Dict[str, tuple] = {}
+        for order, pos in enumerate(PARTS_OF_SPEECH):
+            for lemma, tagged, offsets in read_index(os.path.join(self.directory, f"index.{pos}")):
+                if not HEADWORD_RE.fullmatch(lemma):
+                    continue
+                rank = (tagged, len(offsets), -order)
+                if lemma not in best or rank > best[lemma][0]:
+                    best[lemma] = (rank, pos, offsets)
+
+        entries: Dict[str, List[str]] = {}
+        for lemma, (_, pos, offsets) in sorted(best.items()):
+            entry = self._entry(lemma, pos, offsets)
+            if entry:
+                entries[lemma] = entry
+        return entries
+
+    def _entry(self, lemma: str, pos: str, offsets: List[int]) -> Optional[List[str]]:
+        meaning = None
+        examples: List[str] = []
+        for offset in offsets:
+            words, definition, usages = self.synset(pos, offset)
+            # Senses that only exist capitalized are proper nouns ("Paris")
+            if lemma not in words:
+                continue
+            if meaning is None:
+                meaning = definition
+            for usage in usages:
+                if len(examples) < EXAMPLES_PER_WORD and uses_word(usage, lemma):
+                    examples.append(as_sentence(usage))
+        if not meaning:
+            return None
+        return [meaning] + examples + [""] * (EXAMPLES_PER_WORD - len(examples))
+
+
+def write_tsv(entries: Dict[str, List[str]], tsv_path: str) -> None:
+    tmp_path = f"{tsv_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for word, fields in sorted(entries.items()):
+            f.write("\t".join([word] + fields).rstrip("\t") + "\n")
+    os.replace(tmp_path, tsv_path)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "data", "wordnet.tsv"
+    )
+    entries = WordNet(source).entries()
+    write_tsv(entries, target)
+    print(f"Wrote {len(entries)} entries to {target}")
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for word listing serialization (1,000-row pages).
+
+Compares the old path (ORM entity -> WordResponse -> response_model
+validation -> jsonable_encoder -> json.dumps) with the current one
+(column rows -> dicts -> orjson). No database is needed; rows are
+synthetic. Run from the backend directory:
+
+    python -m benchmarks.serialization [--rows 1000] [--repeat 50]
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.words import WordResponse, serialize_word_row
+
+
+def make_rows(count: int) -> List[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "word": f"word{i}",
+            "meaning": "to become less strong or intense " * 2,
+            "example_sentence_1": "The storm began to abate after midnight, and the wind died down.",
+            "example_sentence_2": "Her anger did not abate until she heard the full story.",
+            "source": "pdf",
+            "status": "ready",
+            "created_at": datetime.utcnow(),
+            "is_favorite": i % 7 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def old_path(entities: List[SimpleNamespace], adapter: TypeAdapter) -> bytes:
+    result = [
+        WordResponse(
+            id=str(word.id),
+            word=word.word,
+            meaning=word.meaning,
+            example_sentence_1=word.example_sentence_1,
+            example_sentence_2=word.example_sentence_2,
+            source=word.source,
+            is_favorite=word.is_favorite,
+        )
+        for word in entities
+    ]
+    # What FastAPI does with response_model before rendering JSONResponse
+    validated = adapter.validate_python(result, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def new_path(rows: List[dict]) -> bytes:
+    result = []
+    for row in rows:
+        item = serialize_word_row(row)
+        item["is_favorite"] = row["is_favorite"]
+        item["notes"] = None
+        result.append(item)
+    return orjson.dumps(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    entities = [SimpleNamespace(**row) for row in rows]
+    adapter = TypeAdapter(List[WordResponse])
+
+    assert json.loads(old_path(entities, adapter)) == json.loads(new_path(rows))
+
+    old = min(timeit.repeat(lambda: old_path(entities, adapter), number=1, repeat=args.repeat))
+    new = min(timeit.repeat(lambda: new_path(rows), number=1, repeat=args.repeat))
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  before (pydantic + response_model + json): {old * 1000:8.2f} ms")
+    print(f"  after  (column rows + orjson):             {new * 1000:8.2f} ms")
+    print(f"  speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
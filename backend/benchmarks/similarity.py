@@ -0,0 +1,54 @@
+"""
+Micro-benchmark for similar-word queries against the in-memory index.
+
+Fills a SimilarityIndex with random unit vectors (no database or embedding
+provider needed) and times top-k queries. Run from the backend directory:
+
+    python -m benchmarks.similarity [--words 50000] [--dimensions 256] [--k 10]
+"""
+import argparse
+import random
+import time
+import timeit
+import uuid
+
+import numpy as np
+
+from app.services.similarity import SimilarityIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=50000)
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.words, args.dimensions), dtype=np.float32)
+    ids = [uuid.uuid4() for _ in range(args.words)]
+
+    index = SimilarityIndex(args.dimensions)
+    started = time.perf_counter()
+    for i, (word_id, vector) in enumerate(zip(ids, vectors)):
+        index.upsert(word_id, f"word{i}", vector)
+    load = time.perf_counter() - started
+
+    # Brute-force check of one query against a full sort
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ normalized[0]
+    expected = [ids[i] for i in np.argsort(-scores)[1:args.k + 1]]
+    assert [word_id for word_id, _, _ in index.similar(ids[0], args.k)] == expected
+
+    queries = random.Random(0).choices(ids, k=args.repeat)
+    times = timeit.repeat(lambda: index.similar(queries.pop(), args.k), number=1, repeat=args.repeat)
+    times.sort()
+    print(f"{args.words} words x {args.dimensions} dimensions, top {args.k}, {args.repeat} queries")
+    print(f"  load (incremental upserts): {load * 1000:8.1f} ms")
+    print(f"  query median:               {times[len(times) // 2] * 1000:8.2f} ms")
+    print(f"  query p99:                  {times[int(len(times) * 0.99)] * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
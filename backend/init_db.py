@@ -1,11 +1,16 @@
 """
 Initialize the database with tables.
-Run this script to create all tables without using Alembic.
+Run this script to create all tables, then apply any Alembic migrations
+(columns added to tables that already existed, which create_all skips).
 """
+from alembic import command
+from alembic.config import Config
 from app.db.database import engine, Base
-from app.models import User, Word, UserFavorite, UserNotes
+from app.models import User, Word, UserFavorite, UserNotes, WordForm, PdfUpload, WordEmbedding
 
 if __name__ == "__main__":
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    print("Applying migrations...")
+    command.upgrade(Config("alembic.ini"), "head")
     print("Database tables created successfully!")
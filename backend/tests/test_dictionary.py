@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from app.services.dictionary import (
+    DEFAULT_DICTIONARY_PATH,
+    WORDNET_DICTIONARY_PATH,
+    LocalDictionary,
+    build_index,
+    get_dictionary,
+    open_dictionary,
+)
+from app.services.wordnet import parse_synset, uses_word
+
+TSV = """# word\tmeaning\texample_sentence_1\texample_sentence_2
+zealous\tfull of energetic enthusiasm
+Abate\tto become less strong\tThe storm abated.\tHer anger did not abate.
+candid\ttruthful and straightforward\tShe gave a candid answer.
+
+broken line without a meaning
+"""
+
+
+def build(tmp_path) -> LocalDictionary:
+    tsv_path = tmp_path / "words.tsv"
+    tsv_path.write_text(TSV, encoding="utf-8")
+    index_path = tmp_path / "words.idx"
+    build_index(str(tsv_path), str(index_path))
+    return LocalDictionary(str(index_path))
+
+
+def test_lookup_finds_every_entry(tmp_path):
+    dictionary = build(tmp_path)
+    assert len(dictionary) == 3
+    assert dictionary.lookup("abate") == {
+        "meaning": "to become less strong",
+        "example_sentence_1": "The storm abated.",
+        "example_sentence_2": "Her anger did not abate.",
+    }
+    assert dictionary.lookup("candid")["example_sentence_2"] is None
+    assert dictionary.lookup(" Zealous ") == {
+        "meaning": "full of energetic enthusiasm",
+        "example_sentence_1": None,
+        "example_sentence_2": None,
+    }
+
+
+def test_lookup_misses(tmp_path):
+    dictionary = build(tmp_path)
+    for word in ("", "aaa", "abat", "abates", "candidate", "zzz", "broken"):
+        assert dictionary.lookup(word) is None
+        assert word not in dictionary
+    assert "Abate" in dictionary
+
+
+def test_open_dictionary_rebuilds_stale_index(tmp_path):
+    tsv_path = tmp_path / "words.tsv"
+    tsv_path.write_text("abate\tto lessen\n", encoding="utf-8")
+    assert open_dictionary(str(tsv_path)).lookup("abate")["meaning"] == "to lessen"
+
+    tsv_path.write_text("abate\tto become less intense\n", encoding="utf-8")
+    index_path = tmp_path / "words.idx"
+    os.utime(index_path, (0, 0))
+    assert open_dictionary(str(tsv_path)).lookup("abate")["meaning"] == "to become less intense"
+
+
+def test_bundled_dictionary(tmp_path):
+    index_path = tmp_path / "bundled.idx"
+    build_index(DEFAULT_DICTIONARY_PATH, str(index_path))
+    dictionary = LocalDictionary(str(index_path))
+    assert len(dictionary) > 50
+    assert dictionary.lookup("abate")["meaning"]
+    # Headwords attest lemmas, so inflected-looking ones are not cut down
+    assert "hackneyed" in dictionary and "hackney" not in dictionary
+
+
+def test_chain_prefers_earlier_dictionaries(tmp_path):
+    first = tmp_path / "first.tsv"
+    first.write_text("abate\tto lessen\ncandid\thonest\tA candid reply.\n", encoding="utf-8")
+    second = tmp_path / "second.tsv"
+    second.write_text(
+        "abate\tmake less intense\tThe storm abated.\ncandid\tfrank\tHe was candid.\tB.\nzeal\tfervor\n",
+        encoding="utf-8",
+    )
+    dictionary = get_dictionary(os.pathsep.join([str(first), str(second)]))
+
+    # The meaning comes from the first entry, missing sentences from later ones
+    assert dictionary.lookup("abate") == {
+        "meaning": "to lessen",
+        "example_sentence_1": "The storm abated.",
+        "example_sentence_2": None,
+    }
+    assert dictionary.lookup("candid") == {
+        "meaning": "honest",
+        "example_sentence_1": "A candid reply.",
+        "example_sentence_2": "B.",
+    }
+    assert dictionary.lookup("zeal")["meaning"] == "fervor"
+    assert "zeal" in dictionary and "zeals" not in dictionary
+    assert dictionary.lookup("zeals") is None
+
+
+@pytest.fixture(scope="module")
+def wordnet(tmp_path_factory) -> LocalDictionary:
+    index_path = tmp_path_factory.mktemp("wordnet") / "wordnet.idx"
+    build_index(WORDNET_DICTIONARY_PATH, str(index_path))
+    return LocalDictionary(str(index_path))
+
+
+@pytest.mark.parametrize(
+    "word",
+    ["abstruse", "obfuscate", "perfunctory", "sycophant", "hackneyed", "hackney", "unprecedented"],
+)
+def test_bundled_wordnet_covers_sat_words(wordnet, word):
+    assert wordnet.lookup(word)["meaning"]
+    assert len(wordnet) > 50000
+
+
+def test_parse_wordnet_synset():
+    line = (
+        "00245289 30 v 02 abate 0 slack 1 003 @ 00244625 v 0000 | make less active or intense; "
+        '"the storm abated"; "The rain let up after a few hours"'
+    )
+    assert parse_synset(line) == (
+        ["abate", "slack"],
+        "make less active or intense",
+        ["the storm abated", "The rain let up after a few hours"],
+    )
+    assert uses_word("the storm abated", "abate")
+    assert not uses_word("The rain let up after a few hours", "abate")
@@ -0,0 +1,94 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from app.services.enrichment import (
+    EnrichmentProvider,
+    WordNotFoundError,
+    enrich_word,
+)
+from app.services.llm_scheduler import LLMUnavailableError
+
+
+class StubDictionary(EnrichmentProvider):
+    name = "dictionary"
+
+    def __init__(self, entries: Dict[str, Dict[str, str]]):
+        self.entries = entries
+
+    async def enrich(self, word, known, priority):
+        return dict(self.entries.get(word, {}))
+
+
+class StubLLM(EnrichmentProvider):
+    name = "llm"
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls: List[tuple] = []
+
+    async def enrich(self, word, known, priority):
+        self.calls.append((word, dict(known)))
+        if self.fail:
+            raise LLMUnavailableError("provider down")
+        result = {"example_sentence_1": f"{word} one.", "example_sentence_2": f"{word} two."}
+        if not known.get("meaning"):
+            result["meaning"] = f"meaning of {word}"
+        return result
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_dictionary_meaning_then_llm_sentences():
+    llm = StubLLM()
+    chain = [StubDictionary({"abate": {"meaning": "to lessen"}}), llm]
+    data = run(enrich_word("abate", providers=chain))
+    assert data == {
+        "meaning": "to lessen",
+        "example_sentence_1": "abate one.",
+        "example_sentence_2": "abate two.",
+    }
+    assert llm.calls == [("abate", {"meaning": "to lessen"})]
+
+
+def test_complete_dictionary_entry_skips_llm():
+    llm = StubLLM()
+    entry = {"meaning": "m", "example_sentence_1": "s1", "example_sentence_2": "s2"}
+    data = run(enrich_word("abate", providers=[StubDictionary({"abate": entry}), llm]))
+    assert data == entry
+    assert llm.calls == []
+
+
+def test_unknown_word_goes_to_llm():
+    llm = StubLLM()
+    data = run(enrich_word("zeal", providers=[StubDictionary({}), llm]))
+    assert data["meaning"] == "meaning of zeal"
+    assert llm.calls == [("zeal", {})]
+
+
+def test_deferred_sentences_do_not_wait_on_llm():
+    llm = StubLLM(fail=True)
+    chain = [StubDictionary({"abate": {"meaning": "to lessen"}}), llm]
+    data = run(enrich_word("abate", providers=chain, defer_sentences=True))
+    assert data == {"meaning": "to lessen", "example_sentence_1": None, "example_sentence_2": None}
+    assert llm.calls == []
+
+
+def test_known_meaning_only_asks_for_sentences():
+    llm = StubLLM()
+    data = run(enrich_word("abate", providers=[StubDictionary({}), llm], known={"meaning": "to lessen"}))
+    assert data["meaning"] == "to lessen"
+    assert data["example_sentence_1"] == "abate one."
+
+
+def test_llm_failure_propagates():
+    with pytest.raises(LLMUnavailableError):
+        run(enrich_word("zeal", providers=[StubDictionary({}), StubLLM(fail=True)]))
+
+
+def test_word_nobody_defines():
+    with pytest.raises(WordNotFoundError):
+        run(enrich_word("zeal", providers=[StubDictionary({})]))
@@ -0,0 +1,117 @@
+import pytest
+
+from app.services.lemmatizer import candidates, group_by_lemma, lemmatize
+
+
+@pytest.mark.parametrize(
+    "word, lemma",
+    [
+        ("abated", "abate"),
+        ("abating", "abate"),
+        ("received", "receive"),
+        ("caused", "cause"),
+        ("provided", "provide"),
+        ("argued", "argue"),
+        ("continued", "continue"),
+        ("assumed", "assume"),
+        ("goes", "go"),
+        ("does", "do"),
+        ("hoped", "hope"),
+        ("hoping", "hope"),
+        ("hopped", "hop"),
+        ("planned", "plan"),
+        ("jumped", "jump"),
+        ("visited", "visit"),
+        ("focused", "focus"),
+        ("avoided", "avoid"),
+        ("ruined", "ruin"),
+        ("heroes", "hero"),
+        ("theories", "theory"),
+        ("taught", "teach"),
+        ("compelling", "compel"),
+        ("propelled", "propel"),
+        ("focussed", "focus"),
+        ("always", "always"),
+    ],
+)
+def test_most_likely_candidate(word, lemma):
+    assert candidates(word)[0] == lemma
+
+
+def test_word_is_last_candidate():
+    assert candidates("abated")[-1] == "abated"
+    assert candidates("species") == ["species"]
+
+
+@pytest.mark.parametrize("word", ["hoped", "hoping"])
+def test_silent_e_stem_never_ranks_the_short_verb(word):
+    assert "hop" not in candidates(word)
+    assert lemmatize(word, {"hop"}) == "hope"
+
+
+def test_lemmatize_prefers_vocabulary():
+    assert lemmatize("ruining", {"ruin"}) == "ruin"
+    assert lemmatize("unprecedented", {"unprecedented"}) == "unprecedented"
+
+
+def test_group_merges_forms_onto_a_known_base():
+    assert group_by_lemma(["abated", "abating"], known={"abate"}) == {
+        "abate": ["abated", "abating"]
+    }
+
+
+@pytest.mark.parametrize(
+    "word",
+    [
+        "hackneyed",
+        "unprecedented",
+        "compelling",
+        "scathing",
+        "enterprising",
+        "pleasing",
+        "unwitting",
+        "cosmos",
+        "abated",
+    ],
+)
+def test_group_keeps_forms_without_an_attested_base(word):
+    assert group_by_lemma([word]) == {word: [word]}
+
+
+def test_group_never_picks_an_unattested_stem_over_a_known_form():
+    # "hackney" is the first candidate, but only the headword is attested
+    assert candidates("hackneyed")[0] == "hackney"
+    assert group_by_lemma(["hackneyed"], known={"hackneyed"}) == {"hackneyed": ["hackneyed"]}
+    # A known form is never cut down to a known stem either
+    assert group_by_lemma(["hackneyed"], known={"hackney", "hackneyed"}) == {
+        "hackneyed": ["hackneyed"]
+    }
+    assert lemmatize("hackneyed", {"hackney", "hackneyed"}) == "hackneyed"
+    assert group_by_lemma(["compelling", "compelled"], known={"compel"}) == {
+        "compel": ["compelled", "compelling"]
+    }
+
+
+def test_group_uses_base_word_in_batch():
+    assert group_by_lemma(["abate", "Abated", "abating"]) == {
+        "abate": ["abate", "abated", "abating"]
+    }
+
+
+def test_group_does_not_merge_into_unrelated_short_word():
+    assert group_by_lemma(["hop", "hoped", "hoping"]) == {
+        "hop": ["hop"],
+        "hoped": ["hoped"],
+        "hoping": ["hoping"],
+    }
+    assert group_by_lemma(["hop", "hoped", "hoping"], known={"hope"}) == {
+        "hop": ["hop"],
+        "hope": ["hoped", "hoping"],
+    }
+
+
+def test_group_prefers_known_lemmas():
+    assert group_by_lemma(["ruined"], known={"ruin"}) == {"ruin": ["ruined"]}
+    assert group_by_lemma(["unprecedented"], known={"unprecedented"}) == {
+        "unprecedented": ["unprecedented"]
+    }
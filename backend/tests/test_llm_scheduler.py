@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_scheduler import (
+    MIN_RATE_FRACTION,
+    CircuitOpenError,
+    LLMScheduler,
+    LLMUnavailableError,
+    RetryableError,
+    TokenBucket,
+)
+
+
+def make_scheduler(**kwargs) -> LLMScheduler:
+    options = dict(
+        requests_per_minute=6000,
+        tokens_per_minute=1_000_000,
+        max_retries=0,
+        breaker_threshold=1,
+        breaker_cooldown=0.05,
+    )
+    options.update(kwargs)
+    return LLMScheduler(**options)
+
+
+async def failing():
+    raise RetryableError("provider unavailable")
+
+
+async def succeeding():
+    return "ok"
+
+
+def test_breaker_opens_after_failures():
+    scheduler = make_scheduler()
+
+    async def scenario():
+        with pytest.raises(LLMUnavailableError):
+            await scheduler.run(failing, 1)
+        with pytest.raises(CircuitOpenError):
+            await scheduler.run(succeeding, 1)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_probe_does_not_keep_breaker_open():
+    scheduler = make_scheduler()
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        with pytest.raises(LLMUnavailableError):
+            await scheduler.run(failing, 1)
+        await asyncio.sleep(0.06)  # cooldown over: the next call is the probe
+
+        probe = asyncio.ensure_future(scheduler.run(hanging, 1))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert await scheduler.run(succeeding, 1) == "ok"
+        assert not scheduler.breaker.is_open
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_slows_the_buckets_and_successes_recover():
+    scheduler = make_scheduler(breaker_threshold=100)
+    configured = scheduler.requests.rate
+
+    async def rate_limited():
+        raise RetryableError("429", rate_limited=True)
+
+    async def scenario():
+        with pytest.raises(LLMUnavailableError):
+            await scheduler.run(rate_limited, 1)
+        assert scheduler.requests.rate == configured / 2
+        assert scheduler.tokens.rate == scheduler.tokens.configured_rate / 2
+
+        while scheduler.requests.rate < configured:
+            assert await scheduler.run(succeeding, 1) == "ok"
+        assert scheduler.requests.rate == configured
+
+    asyncio.run(scenario())
+
+
+def test_transient_errors_do_not_slow_the_buckets():
+    scheduler = make_scheduler(breaker_threshold=100)
+
+    async def scenario():
+        with pytest.raises(LLMUnavailableError):
+            await scheduler.run(failing, 1)
+
+    asyncio.run(scenario())
+    assert scheduler.requests.rate == scheduler.requests.configured_rate
+
+
+def test_slow_down_honors_retry_after_and_the_floor():
+    bucket = TokenBucket(60)
+    bucket.slow_down(pause=5)
+    assert bucket.rate == 0.5
+    assert bucket.delay_for(1) >= 5
+
+    for _ in range(10):
+        bucket.slow_down()
+    assert bucket.rate == pytest.approx(MIN_RATE_FRACTION)
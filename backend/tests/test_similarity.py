@@ -0,0 +1,156 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.models.word import WORD_STATUS_READY
+from app.services import similarity
+from app.services.embeddings import LocalEmbeddingProvider, embedding_text, to_bytes
+from app.services.similarity import SYNC_OVERLAP, SimilarityIndex
+
+
+def unit(*values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float32)
+
+
+def test_upsert_grows_and_replaces():
+    index = SimilarityIndex(2, capacity=1)
+    ids = [uuid.uuid4() for _ in range(5)]
+    for i, word_id in enumerate(ids):
+        index.upsert(word_id, f"word{i}", unit(1, i))
+    assert len(index) == 5
+    assert all(word_id in index for word_id in ids)
+
+    # Replacing a vector keeps one row per word
+    index.upsert(ids[0], "word0", unit(0, 1))
+    assert len(index) == 5
+    assert index.similar(ids[0], 1)[0][0] == ids[4]
+
+
+def test_upsert_rejects_wrong_dimensions():
+    with pytest.raises(ValueError):
+        SimilarityIndex(3).upsert(uuid.uuid4(), "word", unit(1, 0))
+
+
+def test_similar_is_ordered_and_excludes_the_word():
+    index = SimilarityIndex(2)
+    query, near, middle, far = (uuid.uuid4() for _ in range(4))
+    index.upsert(query, "query", unit(1, 0))
+    index.upsert(far, "far", unit(-1, 0))
+    index.upsert(middle, "middle", unit(1, 1))
+    index.upsert(near, "near", unit(10, 1))
+
+    results = index.similar(query, 10)
+    assert [word for _, word, _ in results] == ["near", "middle", "far"]
+    assert results[1][2] == pytest.approx(np.sqrt(0.5))
+    assert [word for _, word, _ in index.similar(query, 2)] == ["near", "middle"]
+
+
+def test_similar_edge_cases():
+    index = SimilarityIndex(2)
+    only = uuid.uuid4()
+    index.upsert(only, "only", unit(1, 0))
+    assert index.similar(only) == []
+    with pytest.raises(KeyError):
+        index.similar(uuid.uuid4())
+
+
+def embed(provider, texts):
+    return asyncio.run(provider.embed(texts))
+
+
+def test_local_provider_is_deterministic_unit_length():
+    texts = [embedding_text("abate", "to become less intense"), "zeal"]
+    first = embed(LocalEmbeddingProvider(64), texts)
+    second = embed(LocalEmbeddingProvider(64), texts)
+    assert first.shape == (2, 64) and first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-6)
+    assert embed(LocalEmbeddingProvider(64), []).shape == (0, 64)
+
+
+def test_local_provider_puts_related_meanings_closer():
+    abate, subside, zealous = embed(
+        LocalEmbeddingProvider(),
+        [
+            embedding_text("abate", "to become less strong or intense"),
+            embedding_text("subside", "to become less intense or strong"),
+            embedding_text("zealous", "full of energetic enthusiasm"),
+        ],
+    )
+    assert abate @ subside > abate @ zealous
+
+
+class FakeSession:
+    """Returns canned rows for each execute and keeps the statements."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return self.batches.pop(0)
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    index = SimilarityIndex(similarity.get_embedding_provider().dimensions)
+    monkeypatch.setattr(similarity, "_index", index)
+    return index
+
+
+def row(word_id, word, updated_at, axis):
+    vector = np.zeros(similarity.get_embedding_provider().dimensions, dtype=np.float32)
+    vector[axis] = 1.0
+    return word_id, word, to_bytes(vector), updated_at
+
+
+def test_sync_index_loads_then_only_pulls_since_the_watermark(fresh_index):
+    first, second = uuid.uuid4(), uuid.uuid4()
+    t1, t2 = datetime(2026, 1, 1, 12), datetime(2026, 1, 1, 13)
+    db = FakeSession(
+        [row(first, "abate", t2, axis=0), row(second, "zeal", t1, axis=1)],
+        [row(second, "zeal", t2 + timedelta(minutes=5), axis=0)],
+    )
+
+    assert similarity.sync_index(db) is fresh_index
+    assert len(fresh_index) == 2
+    assert fresh_index.watermark == t2
+    assert "updated_at >=" not in str(db.statements[0])
+
+    # Within EMBEDDING_REFRESH_SECONDS nothing is queried
+    similarity.sync_index(db)
+    assert len(db.statements) == 1
+
+    similarity.sync_index(db, force=True)
+    since = db.statements[1].compile().params
+    assert t2 - SYNC_OVERLAP in since.values()
+    # The re-read row replaced its vector instead of adding a row
+    assert len(fresh_index) == 2
+    assert fresh_index.similar(first, 1)[0][2] == pytest.approx(1.0)
+    assert fresh_index.watermark == t2 + timedelta(minutes=5)
+
+
+def test_store_embeddings_skips_an_unloaded_index(fresh_index):
+    class Word:
+        def __init__(self, word):
+            self.id, self.word, self.meaning, self.status = uuid.uuid4(), word, None, WORD_STATUS_READY
+
+    class Session:
+        def execute(self, stmt):
+            pass
+
+        def commit(self):
+            pass
+
+    words = [Word("abate"), Word("zeal")]
+    assert asyncio.run(similarity.store_embeddings(Session(), words)) == 2
+    # Never synced, as in the worker or the CLI: the vectors only go to the table
+    assert len(fresh_index) == 0
+
+    fresh_index.synced_at = 0.0
+    asyncio.run(similarity.store_embeddings(Session(), words))
+    assert len(fresh_index) == 2
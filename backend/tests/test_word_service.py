@@ -0,0 +1,180 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import word_service
+from app.services.llm_scheduler import CircuitOpenError, LLMUnavailableError
+
+
+class FakeQuery:
+    def __init__(self, word):
+        self.word = word
+
+    def filter(self, *args):
+        return self
+
+    def one(self):
+        return self.word
+
+
+class FakeSession:
+    """Just enough of a Session for the in-flight waiters."""
+
+    def __init__(self, word=None):
+        self.word = word
+
+    def expire_all(self):
+        pass
+
+    def query(self, *args):
+        return FakeQuery(self.word)
+
+
+@pytest.fixture
+def no_db(monkeypatch):
+    monkeypatch.setattr(word_service, "get_word_by_text", lambda db, text: None)
+    monkeypatch.setattr(word_service, "record_word_forms", lambda db, word, forms: None)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_concurrent_callers_share_one_enrichment(monkeypatch, no_db):
+    word = SimpleNamespace(id=uuid.uuid4(), word="abate")
+    calls = []
+
+    async def enrich_word_once(db, lemma, source, priority):
+        calls.append(lemma)
+        await asyncio.sleep(0.01)
+        return word
+
+    monkeypatch.setattr(word_service, "enrich_word_once", enrich_word_once)
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                word_service.create_word_with_llm(FakeSession(word), "abate", forms=["abate"])
+                for _ in range(5)
+            )
+        )
+
+    results = run(main())
+    assert calls == ["abate"]
+    assert [result.id for result in results] == [word.id] * 5
+    assert word_service._in_flight == {}
+
+
+def test_failed_enrichment_is_released_for_the_next_caller(monkeypatch, no_db):
+    word = SimpleNamespace(id=uuid.uuid4(), word="abate")
+    calls = []
+
+    async def enrich_word_once(db, lemma, source, priority):
+        calls.append(lemma)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise LLMUnavailableError("provider down")
+        return word
+
+    monkeypatch.setattr(word_service, "enrich_word_once", enrich_word_once)
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                word_service.create_word_with_llm(FakeSession(word), "abate", forms=["abate"])
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+
+    results = run(main())
+    # Waiters see the owner's failure instead of hanging
+    assert all(isinstance(result, LLMUnavailableError) for result in results)
+    assert word_service._in_flight == {}
+
+    assert run(word_service.create_word_with_llm(FakeSession(word), "abate", forms=["abate"])) is word
+    assert calls == ["abate", "abate"]
+
+
+@pytest.fixture
+def claimed(monkeypatch):
+    """enrich_word_once with a claim already owned and the DB writes recorded."""
+    word_id = uuid.uuid4()
+    claimed_at = datetime(2026, 1, 1)
+    calls = {"released": [], "stored": []}
+
+    monkeypatch.setattr(word_service, "claim_word", lambda db, lemma, source: (word_id, claimed_at))
+
+    def release(db, word_id, claimed_at, count_attempt):
+        calls["released"].append((word_id, claimed_at, count_attempt))
+
+    def store(db, word_id, claimed_at, data):
+        calls["stored"].append((word_id, claimed_at))
+        return calls.get("store_result", True)
+
+    monkeypatch.setattr(word_service, "_release_claim", release)
+    monkeypatch.setattr(word_service, "_store_claimed", store)
+    calls.update(word_id=word_id, claimed_at=claimed_at)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "error, counted",
+    [
+        (LLMUnavailableError("provider down"), True),
+        (CircuitOpenError("circuit open", retry_after=1), False),
+    ],
+)
+def test_failure_releases_the_claim(monkeypatch, claimed, error, counted):
+    async def enrich_word(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(word_service, "enrich_word", enrich_word)
+    with pytest.raises(type(error)):
+        run(word_service.enrich_word_once(FakeSession(), "abate", "test"))
+    assert claimed["released"] == [(claimed["word_id"], claimed["claimed_at"], counted)]
+    assert claimed["stored"] == []
+
+
+def test_result_is_only_written_under_our_claim(monkeypatch, claimed):
+    async def enrich_word(*args, **kwargs):
+        return {"meaning": "m", "example_sentence_1": None, "example_sentence_2": None}
+
+    theirs = SimpleNamespace(id=claimed["word_id"], word="abate")
+
+    async def wait_for_word(db, lemma):
+        return theirs
+
+    monkeypatch.setattr(word_service, "enrich_word", enrich_word)
+    monkeypatch.setattr(word_service, "wait_for_word", wait_for_word)
+    claimed["store_result"] = False  # somebody took the claim over
+
+    assert run(word_service.enrich_word_once(FakeSession(), "abate", "test")) is theirs
+    assert claimed["stored"] == [(claimed["word_id"], claimed["claimed_at"])]
+    assert claimed["released"] == []
+
+
+def test_keep_claims_refreshes_until_cancelled(monkeypatch):
+    monkeypatch.setattr(word_service, "CLAIM_TIMEOUT", timedelta(seconds=0.03))
+    refreshed = []
+
+    def refresh_claims(db, word_ids, claimed_at):
+        refreshed.append(claimed_at)
+        return claimed_at + timedelta(seconds=1)
+
+    monkeypatch.setattr(word_service, "refresh_claims", refresh_claims)
+    start = datetime(2026, 1, 1)
+    claim = {"claimed_at": start}
+
+    async def main():
+        task = asyncio.create_task(word_service.keep_claims(None, [uuid.uuid4()], claim))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    run(main())
+    # Each refresh extends the latest claim, not the original one
+    assert refreshed[:2] == [start, start + timedelta(seconds=1)]
+    assert claim["claimed_at"] == start + timedelta(seconds=len(refreshed))
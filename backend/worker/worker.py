@@ -1,88 +1,117 @@
 """
-Background worker service for processing words from SQS.
-In production, this would run as a separate service (ECS task or Lambda).
+Background worker service for enriching words published to the word queue.
+In production, this would run as a separate service (ECS task or Lambda)
+against SQS; locally it reads the SQLite queue (see app/services/word_queue.py).
+
+Run locally from the backend directory:
+    python -m worker.worker
 """
-import os
-import json
-import boto3
+import asyncio
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 from app.db.database import SessionLocal
-from app.services.word_service import create_word_with_llm
-from app.models.word import Word
+from app.services.word_service import (
+    create_word_with_llm,
+    fill_missing_sentences,
+    get_word_by_text,
+    record_word_forms,
+    retry_pending_words,
+)
+from app.services.word_queue import QueueMessage, WordQueue, get_word_queue
+from app.services.llm_scheduler import LLMUnavailableError, PRIORITY_BULK
+from app.models.word import WORD_STATUS_READY
 
 load_dotenv()
 
-# SQS configuration
-SQS_QUEUE_URL = os.getenv("SQS_QUEUE_URL")
-sqs_client = boto3.client(
-    "sqs",
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    region_name=os.getenv("AWS_REGION", "us-east-1"),
-)
+
+async def process_message(queue: WordQueue, message: QueueMessage) -> None:
+    """Enrich the word in one queue message, deleting the message when done."""
+    body = message.body
+    word_text = body.get("word")
+    source = body.get("source", "pdf")
+    forms = body.get("forms")
+
+    if not word_text:
+        print(f"Invalid message: {body}")
+        queue.delete(message)
+        return
+
+    db: Session = SessionLocal()
+    try:
+        # Check if word already exists (under any form)
+        existing = get_word_by_text(db, word_text)
+        if existing and existing.status == WORD_STATUS_READY:
+            # A later upload may have brought new forms of a known word
+            record_word_forms(db, existing, [word_text, *(forms or [])])
+            print(f"Word {word_text} already exists")
+            queue.delete(message)
+            return
+
+        # Create word with LLM generation
+        try:
+            word = await create_word_with_llm(
+                db, word_text, source, forms=forms, priority=PRIORITY_BULK
+            )
+            print(f"Created word: {word.word} (ID: {word.id})")
+        except LLMUnavailableError as e:
+            # The word is kept pending and picked up by retry_pending()
+            print(f"Word {word_text} left pending: {e}")
+            if e.retry_after:
+                await asyncio.sleep(e.retry_after)
+
+        # Delete message from queue after processing
+        queue.delete(message)
+
+    except Exception as e:
+        # Not deleted: the message becomes visible again after the timeout
+        print(f"Error processing message: {e}")
+    finally:
+        db.close()
 
 
 def process_word_from_queue():
     """
-    Poll SQS queue for word processing jobs and process them.
-    In production, this would run continuously.
+    Poll the word queue for word processing jobs and process them.
+    A batch of messages is enriched concurrently.
     """
-    if not SQS_QUEUE_URL:
-        print("SQS_QUEUE_URL not configured. Skipping queue processing.")
+    queue = get_word_queue()
+
+    try:
+        messages = queue.receive(wait_seconds=20)  # Long polling
+    except Exception as e:
+        print(f"Error receiving messages: {e}")
         return
-    
+
+    if messages:
+        asyncio.run(_process_batch(queue, messages))
+
+
+async def _process_batch(queue: WordQueue, messages: list) -> None:
+    await asyncio.gather(*(process_message(queue, message) for message in messages))
+
+
+def retry_pending():
+    """Retry enrichment of words left pending after LLM failures."""
     db: Session = SessionLocal()
-    
     try:
-        # Receive messages from SQS
-        response = sqs_client.receive_message(
-            QueueUrl=SQS_QUEUE_URL,
-            MaxNumberOfMessages=1,
-            WaitTimeSeconds=20,  # Long polling
-        )
-        
-        messages = response.get("Messages", [])
-        
-        for message in messages:
-            try:
-                body = json.loads(message["Body"])
-                word_text = body.get("word")
-                source = body.get("source", "pdf")
-                
-                if not word_text:
-                    print(f"Invalid message: {body}")
-                    continue
-                
-                # Check if word already exists
-                existing = db.query(Word).filter(Word.word == word_text.lower()).first()
-                if existing:
-                    print(f"Word {word_text} already exists")
-                    # Delete message from queue
-                    sqs_client.delete_message(
-                        QueueUrl=SQS_QUEUE_URL,
-                        ReceiptHandle=message["ReceiptHandle"],
-                    )
-                    continue
-                
-                # Create word with LLM generation
-                import asyncio
-                word = asyncio.run(create_word_with_llm(db, word_text, source))
-                print(f"Created word: {word.word} (ID: {word.id})")
-                
-                # Delete message from queue after successful processing
-                sqs_client.delete_message(
-                    QueueUrl=SQS_QUEUE_URL,
-                    ReceiptHandle=message["ReceiptHandle"],
-                )
-                
-            except Exception as e:
-                print(f"Error processing message: {e}")
-                # In production, you might want to send to DLQ after retries
-                continue
-    
+        finished = asyncio.run(retry_pending_words(db))
+        if finished:
+            print(f"Finished {finished} pending words")
     except Exception as e:
-        print(f"Error receiving messages: {e}")
+        print(f"Error retrying pending words: {e}")
+    finally:
+        db.close()
+
+
+def fill_sentences():
+    """Add example sentences to words defined without them (e.g. by the dictionary)."""
+    db: Session = SessionLocal()
+    try:
+        filled = asyncio.run(fill_missing_sentences(db))
+        if filled:
+            print(f"Added example sentences to {filled} words")
+    except Exception as e:
+        print(f"Error filling example sentences: {e}")
     finally:
         db.close()
 
@@ -91,3 +120,5 @@ if __name__ == "__main__":
     print("Starting word processing worker...")
     while True:
         process_word_from_queue()
+        retry_pending()
+        fill_sentences()
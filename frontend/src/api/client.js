@@ -2,6 +2,10 @@ import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api'
 
+// Time of this client's last write, echoed back so reads that follow it
+// are served from the primary database rather than a lagging replica
+const LAST_WRITE_HEADER = 'X-Last-Write'
+
 const client = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -16,6 +20,10 @@ client.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
     }
+    const lastWrite = sessionStorage.getItem('last_write')
+    if (lastWrite) {
+      config.headers[LAST_WRITE_HEADER] = lastWrite
+    }
     return config
   },
   (error) => {
@@ -25,7 +33,13 @@ client.interceptors.request.use(
 
 // Handle auth errors
 client.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const lastWrite = response.headers[LAST_WRITE_HEADER.toLowerCase()]
+    if (lastWrite) {
+      sessionStorage.setItem('last_write', lastWrite)
+    }
+    return response
+  },
   (error) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('auth_token')
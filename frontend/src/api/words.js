@@ -1,8 +1,8 @@
 import client from './client'
 
-export const getWords = async (skip = 0, limit = 100) => {
+export const getWords = async (skip = 0, limit = 100, includeNotes = false) => {
   const response = await client.get('/words', {
-    params: { skip, limit },
+    params: { skip, limit, include_notes: includeNotes },
   })
   return response.data
 }
@@ -12,13 +12,22 @@ export const getWord = async (id) => {
   return response.data
 }
 
+export const getSimilarWords = async (id, limit = 10) => {
+  const response = await client.get(`/words/${id}/similar`, {
+    params: { limit },
+  })
+  return response.data
+}
+
 export const toggleFavorite = async (wordId) => {
   const response = await client.post(`/favorite/${wordId}`)
   return response.data
 }
 
-export const getFavorites = async () => {
-  const response = await client.get('/favorites')
+export const getFavorites = async (includeNotes = false) => {
+  const response = await client.get('/favorites', {
+    params: { include_notes: includeNotes },
+  })
   return response.data
 }
 
@@ -38,6 +47,13 @@ export const getNotes = async (wordId) => {
   return response.data
 }
 
+export const getNotesBatch = async (wordIds) => {
+  const response = await client.get('/notes', {
+    params: { ids: wordIds.join(',') },
+  })
+  return response.data
+}
+
 export const updateNotes = async (wordId, notes) => {
   const response = await client.put(`/notes/${wordId}`, notes)
   return response.data